@@ -1,120 +1,199 @@
-from flask import Flask, render_template
+import importlib
+import importlib.util
 import os
-from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
-
-# Initialize extensions
-db = SQLAlchemy()
-bcrypt = Bcrypt()
-from flask_login import LoginManager
-login_manager = LoginManager()
-login_manager.login_view = 'auth.login'
-login_manager.login_message_category = 'info'
-
-@login_manager.user_loader
+import threading
+
+
 def load_user(user_id):
+    from flask import g
+    from backend import db
     from backend.models.user import User
-    return User.query.get(int(user_id))
+
+    user_id = int(user_id)
+    cached = g.get('_user')
+    if cached is not None and cached.id == user_id:
+        return cached
+
+    user = db.session.get(User, user_id)
+    g._user = user
+    return user
+
+
+# Extensions are built on first access (PEP 562 module __getattr__), so
+# importing `backend` does not pull in SQLAlchemy, bcrypt or Flask-Login.
+def _build_db():
+    from flask_sqlalchemy import SQLAlchemy
+    return SQLAlchemy()
+
+def _build_bcrypt():
+    from flask_bcrypt import Bcrypt
+    return Bcrypt()
+
+def _build_login_manager():
+    from flask_login import LoginManager
+    login_manager = LoginManager()
+    login_manager.login_view = 'auth.login'
+    login_manager.login_message_category = 'info'
+    login_manager.user_loader(load_user)
+    return login_manager
+
+_EXTENSION_BUILDERS = {
+    'db': _build_db,
+    'bcrypt': _build_bcrypt,
+    'login_manager': _build_login_manager,
+}
+_extension_lock = threading.Lock()
+
+def __getattr__(name):
+    builder = _EXTENSION_BUILDERS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _extension_lock:
+        if name not in globals():
+            globals()[name] = builder()
+    return globals()[name]
 
 from datetime import datetime
 
+# Paths resolved once at import (the backend directory holds this __init__.py)
+BACKEND_ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_FOLDER = os.path.join(BACKEND_ROOT, 'static')
+TEMPLATE_FOLDER = os.path.join(BACKEND_ROOT, 'templates')
+DEFAULT_DATABASE_URI = "sqlite:///" + os.path.join(BACKEND_ROOT, "site.db")
+
+# (module, attribute) pairs for every blueprint, in registration order.
+# The disease/ml/chat/disease-type blueprints live in backend.routes and
+# import their view modules lazily on first request.
+BLUEPRINTS = (
+    ('backend.routes', 'disease_bp'),
+    ('backend.routes', 'ml_bp'),
+    ('backend.routes.auth_routes', 'auth_bp'),
+    ('backend.routes.doctor_routes', 'doctor_bp'),
+    ('backend.routes.history_routes', 'history_bp'),
+    ('backend.routes', 'predict_disease_type_bp'),
+    ('backend.routes.general_routes', 'general_bp'),
+    ('backend.routes.scalability_routes', 'scalability_bp'),
+    ('backend.routes', 'chat_bp'),
+)
+
+def _engine_options(database_uri):
+    """
+    SQLAlchemy engine options for a database URI.
+
+    PostgreSQL gets a larger, recycled connection pool; with the psycopg 3
+    driver, statements are also server-side prepared from their first
+    execution. Other databases (SQLite) keep SQLAlchemy's defaults.
+    """
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_uri)
+    if url.get_backend_name() != 'postgresql':
+        return {}
+
+    options = {
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_recycle': 3600,
+        'pool_pre_ping': False,
+    }
+    if url.get_driver_name() == 'psycopg':
+        options['connect_args'] = {'prepare_threshold': 1}
+    return options
+
 def create_app():
-    # Get the backend directory (where this __init__.py file is)
-    backend_root = os.path.dirname(os.path.abspath(__file__))
-    
-    print(f"Backend root: {backend_root}")
-    print(f"Templates folder: {os.path.join(backend_root, 'templates')}")
-    
+    from flask import Flask
+    from backend import db, bcrypt, login_manager
+
     # Initialize Flask app with correct paths
     app = Flask(
         __name__,
-        static_folder=os.path.join(backend_root, 'static'),
-        template_folder=os.path.join(backend_root, 'templates')
+        static_folder=STATIC_FOLDER,
+        template_folder=TEMPLATE_FOLDER
     )
 
+    if app.debug:
+        print(f"Backend root: {BACKEND_ROOT}")
+        print(f"Templates folder: {TEMPLATE_FOLDER}")
+
     # Configure Database
-    database_url = os.getenv("DATABASE_URL")
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL") or DEFAULT_DATABASE_URI
 
-    if database_url:
-        app.config["SQLALCHEMY_DATABASE_URI"] = database_url
-    else:
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(backend_root, "site.db")
+    # Use orjson for jsonify() and request.get_json()
+    from backend.utils.json_provider import ORJSONProvider
+    app.json = ORJSONProvider(app)
 
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
     app.config['SECRET_KEY'] = 'your_secret_key_here' # Change this in production!
+    # Reject oversized bodies with 413 before they are buffered; image
+    # uploads are the largest requests
+    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', str(16 * 1024 * 1024)))
+    # bcrypt cost factor; each step doubles the hashing time at signup/login
+    app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
 
     # Initialize extensions with app
     db.init_app(app)
     bcrypt.init_app(app)
     login_manager.init_app(app)
     
-    # Register Disease Routes Blueprint
-    from backend.routes.disease_routes import disease_bp
-    app.register_blueprint(disease_bp)
-    print("'disease_routes' blueprint registered successfully")
-    
-    # Register ML Routes Blueprint
-    try:
-        from backend.routes.ml_routes import ml_bp  # type: ignore
-        app.register_blueprint(ml_bp)
-        print("'ml_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"Warning: Could not import 'ml_routes'. Error: {e}")
-
-    # Register Auth Routes Blueprint
-    from backend.routes.auth_routes import auth_bp
-    app.register_blueprint(auth_bp)
-    print("'auth_routes' blueprint registered successfully")
-    
-    # Register Doctor Dashboard Routes Blueprint
-    try:
-        from backend.routes.doctor_routes import doctor_bp
-        app.register_blueprint(doctor_bp)
-        print("'doctor_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"Warning: Could not import 'doctor_routes'. Error: {e}")
-    
-    # Register other blueprints if you have them
-    try:
-        from backend.routes.history_routes import history_bp
-        app.register_blueprint(history_bp)
-        print("✅ 'history_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"⚠️ Warning: Could not import 'history_routes'. Error: {e}")
-
-    try:
-        from backend.routes.predict_disease_type_routes import predict_disease_type_bp
-        app.register_blueprint(predict_disease_type_bp)
-        print("'predict_disease_type_bp_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"Warning: Could not import 'predict_disease_type_bp_routes'. Error: {e}")
-
-    try:
-        from backend.routes.general_routes import general_bp
-        app.register_blueprint(general_bp)
-        print("'general_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"Warning: Could not import 'general_routes'. Error: {e}")
-    
-    try:
-        from backend.routes.scalability_routes import scalability_bp
-        app.register_blueprint(scalability_bp)
-        print("'scalability_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"⚠️ Warning: Could not import 'scalability_routes'. Error: {e}")
-
-    try:
-        from backend.routes.chat_routes import chat_bp
-        app.register_blueprint(chat_bp)
-        print("✅ 'chat_routes' blueprint registered successfully")
-    except ImportError as e:
-        print(f"⚠️ Warning: Could not import 'chat_routes'. Error: {e}")
+    # Register blueprints from the manifest; modules that are not present are skipped
+    for module_name, bp_name in BLUEPRINTS:
+        if importlib.util.find_spec(module_name) is None:
+            print(f"Warning: Could not find '{module_name}', skipping '{bp_name}'")
+            continue
+        app.register_blueprint(getattr(importlib.import_module(module_name), bp_name))
+    print(f"{len(app.blueprints)} blueprints registered successfully")
     
     @app.context_processor
     def inject_current_year():
         return {"current_year": datetime.utcnow().year}
 
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create all database tables."""
+        init_db(app, force=True)
+        print("Database tables created")
+
+    # Set DB_INIT=0 on workers once `flask --app run init-db` has been run
+    if os.getenv('DB_INIT', '1') != '0':
+        init_db(app)
+
+    # Set PRELOAD_MODELS=1 to load the image models at startup instead of
+    # on the first /predict request (imports TensorFlow)
+    if os.getenv('PRELOAD_MODELS', '0') == '1':
+        from backend.routes.predict_disease_type_routes import preload_models
+        preload_models()
+
+    return app
+
+
+# Database URIs whose tables were already created in this process
+_initialized_databases = set()
+
+def init_db(app, force=False):
+    """
+    Create database tables once per database URI per process.
+
+    In-memory SQLite URIs are never recorded: each app's engine opens a new,
+    empty database, so its tables are always created.
+
+    Args:
+        app: Flask application instance
+        force: Create tables even if this URI was already initialized
+    """
+    from backend import db
+    from sqlalchemy.engine import make_url
+
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if database_uri in _initialized_databases and not force:
+        return
+
     with app.app_context():
         db.create_all()
 
-    return app
\ No newline at end of file
+    url = make_url(database_uri)
+    in_memory = url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    )
+    if not in_memory:
+        _initialized_databases.add(database_uri)
\ No newline at end of file
@@ -24,6 +24,7 @@ from .error_handler import (
     handle_errors,
     validate_json_request,
     require_fields,
+    json_request,
     success_response,
     error_response
 )
@@ -58,6 +59,7 @@ __all__ = [
     'handle_errors',
     'validate_json_request',
     'require_fields',
+    'json_request',
     'success_response',
     'error_response',
     
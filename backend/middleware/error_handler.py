@@ -3,16 +3,152 @@ Centralized Error Handling Middleware
 Provides consistent error responses and logging across the application
 """
 
-from flask import jsonify, request
-from functools import wraps
-import traceback
-from datetime import datetime
+from flask import request, g, has_app_context, Response
+from werkzeug.exceptions import HTTPException
+from functools import lru_cache
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import queue
 import sys
+import orjson
+
+
+_log = logging.getLogger(__name__)
+
+
+def _now_iso():
+    """
+    Get the ISO timestamp for the current request.
+    
+    Computed once per request and reused by every error/response helper.
+    
+    Returns:
+        ISO 8601 timestamp string (UTC)
+    """
+    in_app_context = has_app_context()
+    timestamp = g.get('_timestamp') if in_app_context else None
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc).isoformat()
+        if in_app_context:
+            g._timestamp = timestamp
+    return timestamp
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread.
+    
+    The stock QueueHandler formats the message and traceback on the calling
+    thread; here the record (with its exc_info) is queued untouched.
+    """
+    
+    def prepare(self, record):
+        return record
+
+
+_error_logger = None
+
+
+def _get_error_logger():
+    """
+    Get or create the error logger.
+    
+    Records go through a queue to a background listener that writes each
+    error to stderr in a single call.
+    
+    Returns:
+        logging.Logger instance
+    """
+    global _error_logger
+    
+    if _error_logger is None:
+        log_queue = queue.SimpleQueue()
+        
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        listener = QueueListener(log_queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        
+        logger = logging.getLogger('disease_prediction.errors')
+        logger.setLevel(logging.ERROR)
+        logger.propagate = False
+        logger.handlers = [_DeferredQueueHandler(log_queue)]
+        _error_logger = logger
+    
+    return _error_logger
+
+
+def _json_prefix(**fields):
+    """
+    Serialize the constant fields of an error body once.
+    
+    The returned bytes stop right after the opening quote of the timestamp
+    value, so a response only has to splice in the timestamp.
+    """
+    return orjson.dumps(fields)[:-1] + b',"timestamp":"'
+
+
+_TIMESTAMP_SUFFIX = b'"}'
+
+_BAD_REQUEST_PREFIX = _json_prefix(
+    error='BadRequest',
+    message='The request could not be understood or was missing required parameters'
+)
+_INTERNAL_ERROR_PREFIX = _json_prefix(
+    error='InternalServerError',
+    message='An internal server error occurred. Please try again later.'
+)
+_UNEXPECTED_ERROR_PREFIX = _json_prefix(
+    error='InternalServerError',
+    message='An unexpected error occurred. Please try again later.'
+)
+
+_SUCCESS_PREFIX = _json_prefix(success=True)
+
+
+@lru_cache(maxsize=256)
+def _error_prefix(message):
+    """Serialize an error_response() body prefix once per message."""
+    return _json_prefix(success=False, error=message)
+
+
+def _static_json_response(prefix, status_code):
+    """Build a JSON response from a pre-serialized prefix and the request timestamp."""
+    return Response(
+        prefix + _now_iso().encode() + _TIMESTAMP_SUFFIX,
+        status=status_code,
+        mimetype='application/json'
+    )
+
+
+def _json_response(data, status_code):
+    """Build a JSON response for payloads that vary per request."""
+    return Response(
+        orjson.dumps(data),
+        status=status_code,
+        mimetype='application/json'
+    )
 
 
 class AppError(Exception):
     """Base exception class for application errors."""
     
+    __slots__ = ('message', 'status_code', 'payload')
+    
+    # Error name used in responses; set automatically for every subclass
+    _name = 'AppError'
+    
+    # Extra (name, value) response headers; subclasses override as needed
+    headers = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._name = cls.__name__
+    
     def __init__(self, message, status_code=500, payload=None):
         """
         Initialize application error.
@@ -30,17 +166,20 @@ class AppError(Exception):
     def to_dict(self):
         """Convert error to dictionary."""
         error_dict = {
-            'error': self.__class__.__name__,
+            'error': self._name,
             'message': self.message,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _now_iso()
         }
-        error_dict.update(self.payload)
+        if self.payload:
+            error_dict.update(self.payload)
         return error_dict
 
 
 class ValidationError(AppError):
     """Exception for validation errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message, field=None, **kwargs):
         """
         Initialize validation error.
@@ -59,6 +198,8 @@ class ValidationError(AppError):
 class NotFoundError(AppError):
     """Exception for resource not found errors."""
     
+    __slots__ = ()
+    
     def __init__(self, resource, resource_id=None):
         """
         Initialize not found error.
@@ -81,6 +222,8 @@ class NotFoundError(AppError):
 class UnauthorizedError(AppError):
     """Exception for unauthorized access errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message="Unauthorized access"):
         """Initialize unauthorized error."""
         super().__init__(message, status_code=401)
@@ -89,6 +232,8 @@ class UnauthorizedError(AppError):
 class ForbiddenError(AppError):
     """Exception for forbidden access errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message="Access forbidden"):
         """Initialize forbidden error."""
         super().__init__(message, status_code=403)
@@ -97,6 +242,8 @@ class ForbiddenError(AppError):
 class RateLimitError(AppError):
     """Exception for rate limit exceeded errors."""
     
+    __slots__ = ()
+    
     def __init__(self, retry_after=60):
         """
         Initialize rate limit error.
@@ -110,11 +257,18 @@ class RateLimitError(AppError):
             status_code=429, 
             payload={'retry_after': retry_after}
         )
+    
+    @property
+    def headers(self):
+        """Retry-After header for the response."""
+        return (('Retry-After', str(self.payload.get('retry_after', 60))),)
 
 
 class PredictionError(AppError):
     """Exception for prediction/ML model errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message, model_name=None):
         """
         Initialize prediction error.
@@ -152,14 +306,8 @@ class ErrorHandler:
         Args:
             app: Flask application instance
         """
-        # Register error handlers
+        # Register error handler (Flask walks the MRO, so this covers every AppError subclass)
         app.errorhandler(AppError)(self.handle_app_error)
-        app.errorhandler(ValidationError)(self.handle_app_error)
-        app.errorhandler(NotFoundError)(self.handle_app_error)
-        app.errorhandler(UnauthorizedError)(self.handle_app_error)
-        app.errorhandler(ForbiddenError)(self.handle_app_error)
-        app.errorhandler(RateLimitError)(self.handle_app_error)
-        app.errorhandler(PredictionError)(self.handle_app_error)
         
         # Register HTTP error handlers
         app.errorhandler(400)(self.handle_400)
@@ -167,10 +315,13 @@ class ErrorHandler:
         app.errorhandler(405)(self.handle_405)
         app.errorhandler(500)(self.handle_500)
         
+        # Other HTTP errors (401, 413, ...) keep their own status code
+        app.errorhandler(HTTPException)(self.handle_http_error)
+        
         # Register generic exception handler
         app.errorhandler(Exception)(self.handle_generic_error)
         
-        print("✅ ErrorHandler initialized")
+        _log.debug("ErrorHandler initialized")
     
     def handle_app_error(self, error):
         """
@@ -182,54 +333,49 @@ class ErrorHandler:
         Returns:
             JSON response with error details
         """
-        response = jsonify(error.to_dict())
-        response.status_code = error.status_code
+        response = _json_response(error.to_dict(), error.status_code)
         
-        # Add retry-after header for rate limit errors
-        if isinstance(error, RateLimitError):
-            response.headers['Retry-After'] = str(error.payload.get('retry_after', 60))
+        # Add error-specific headers (e.g. Retry-After for rate limit errors)
+        for name, value in error.headers:
+            response.headers[name] = value
         
         # Log error
-        self._log_error(error, error.status_code)
+        self._log_error(error, error.status_code, request.environ)
         
         return response
     
     def handle_400(self, error):
         """Handle 400 Bad Request errors."""
-        return jsonify({
-            'error': 'BadRequest',
-            'message': 'The request could not be understood or was missing required parameters',
-            'timestamp': datetime.now().isoformat()
-        }), 400
+        return _static_json_response(_BAD_REQUEST_PREFIX, 400)
     
     def handle_404(self, error):
         """Handle 404 Not Found errors."""
-        return jsonify({
+        return _json_response({
             'error': 'NotFound',
             'message': f'The requested resource was not found: {request.path}',
             'path': request.path,
-            'timestamp': datetime.now().isoformat()
-        }), 404
+            'timestamp': _now_iso()
+        }, 404)
     
     def handle_405(self, error):
         """Handle 405 Method Not Allowed errors."""
-        return jsonify({
+        return _json_response({
             'error': 'MethodNotAllowed',
             'message': f'Method {request.method} is not allowed for {request.path}',
             'method': request.method,
             'path': request.path,
-            'timestamp': datetime.now().isoformat()
-        }), 405
+            'timestamp': _now_iso()
+        }, 405)
+    
+    def handle_http_error(self, error):
+        """Handle HTTP errors without a dedicated handler."""
+        return error
     
     def handle_500(self, error):
         """Handle 500 Internal Server Error."""
-        self._log_error(error, 500)
+        self._log_error(error, 500, request.environ)
         
-        return jsonify({
-            'error': 'InternalServerError',
-            'message': 'An internal server error occurred. Please try again later.',
-            'timestamp': datetime.now().isoformat()
-        }), 500
+        return _static_json_response(_INTERNAL_ERROR_PREFIX, 500)
     
     def handle_generic_error(self, error):
         """
@@ -242,51 +388,50 @@ class ErrorHandler:
             JSON response with error details
         """
         # Log full traceback
-        self._log_error(error, 500, include_traceback=True)
+        self._log_error(error, 500, request.environ, include_traceback=True)
         
         # Return generic error response (don't expose internal details)
-        return jsonify({
-            'error': 'InternalServerError',
-            'message': 'An unexpected error occurred. Please try again later.',
-            'timestamp': datetime.now().isoformat()
-        }), 500
+        return _static_json_response(_UNEXPECTED_ERROR_PREFIX, 500)
     
-    def _log_error(self, error, status_code, include_traceback=False):
+    def _log_error(self, error, status_code, environ, include_traceback=False):
         """
         Log error details.
         
         Args:
             error: Error instance
             status_code: HTTP status code
+            environ: WSGI environ of the failing request
             include_traceback: Whether to include full traceback
         """
-        error_info = {
-            'timestamp': datetime.now().isoformat(),
-            'status_code': status_code,
-            'error_type': type(error).__name__,
-            'message': str(error),
-            'path': request.path,
-            'method': request.method,
-            'remote_addr': request.remote_addr
-        }
-        
-        # Print error info
-        print(f"\n{'='*60}")
-        print(f"❌ ERROR: {error_info['error_type']}")
-        print(f"{'='*60}")
-        print(f"Message: {error_info['message']}")
-        print(f"Status: {error_info['status_code']}")
-        print(f"Path: {error_info['path']}")
-        print(f"Method: {error_info['method']}")
-        print(f"IP: {error_info['remote_addr']}")
-        print(f"Time: {error_info['timestamp']}")
-        
-        # Include traceback for 500 errors
-        if include_traceback:
-            print(f"\nTraceback:")
-            traceback.print_exc()
+        separator = '=' * 60
+        message = (
+            f"\n{separator}\n"
+            f"❌ ERROR: {type(error).__name__}\n"
+            f"{separator}\n"
+            f"Message: {error}\n"
+            f"Status: {status_code}\n"
+            f"Path: {environ.get('PATH_INFO', '')}\n"
+            f"Method: {environ.get('REQUEST_METHOD', '')}\n"
+            f"IP: {environ.get('REMOTE_ADDR', '')}\n"
+            f"Time: {_now_iso()}\n"
+            f"{separator}"
+        )
         
-        print(f"{'='*60}\n")
+        # Include traceback for 500 errors (formatted by the listener thread)
+        _get_error_logger().error(message, exc_info=include_traceback)
+
+
+def _wrap(wrapper, f):
+    """
+    Copy the attributes Flask needs from a view onto its wrapper.
+    
+    Lighter than functools.wraps: only the name, qualified name and
+    __wrapped__ are copied.
+    """
+    wrapper.__name__ = f.__name__
+    wrapper.__qualname__ = getattr(f, '__qualname__', f.__name__)
+    wrapper.__wrapped__ = f
+    return wrapper
 
 
 def handle_errors(f):
@@ -301,7 +446,6 @@ def handle_errors(f):
             # Your code here
             pass
     """
-    @wraps(f)
     def decorated_function(*args, **kwargs):
         try:
             return f(*args, **kwargs)
@@ -319,12 +463,14 @@ def handle_errors(f):
             raise NotFoundError("File", str(e))
         except Exception as e:
             # Log unexpected errors
-            print(f"❌ Unexpected error in {f.__name__}: {str(e)}")
-            traceback.print_exc()
+            _get_error_logger().error(
+                f"❌ Unexpected error in {f.__name__}: {str(e)}",
+                exc_info=True
+            )
             # Re-raise to be handled by generic error handler
             raise
     
-    return decorated_function
+    return _wrap(decorated_function, f)
 
 
 def validate_json_request(f):
@@ -338,7 +484,6 @@ def validate_json_request(f):
             data = request.get_json()
             # data is guaranteed to be valid JSON
     """
-    @wraps(f)
     def decorated_function(*args, **kwargs):
         if not request.is_json:
             raise ValidationError(
@@ -346,16 +491,14 @@ def validate_json_request(f):
                 payload={'content_type': request.content_type}
             )
         
-        try:
-            data = request.get_json()
-            if data is None:
-                raise ValidationError("Request body is empty")
-        except Exception as e:
-            raise ValidationError(f"Invalid JSON: {str(e)}")
+        # Parsed once; later get_json() calls reuse Flask's cached result
+        data = request.get_json(silent=True, cache=True)
+        if data is None:
+            raise ValidationError("Invalid JSON: request body is empty or malformed")
         
         return f(*args, **kwargs)
     
-    return decorated_function
+    return _wrap(decorated_function, f)
 
 
 def require_fields(*required_fields):
@@ -372,20 +515,21 @@ def require_fields(*required_fields):
             data = request.get_json()
             # data['disease'] and data['symptoms'] are guaranteed to exist
     """
+    # Bound once per decoration; the check itself runs in C
+    has_required_fields = frozenset(required_fields).issubset
+    
     def decorator(f):
-        @wraps(f)
         def decorated_function(*args, **kwargs):
-            data = request.get_json()
+            data = request.get_json(silent=True, cache=True)
             
             if not data:
                 raise ValidationError("Request body is empty")
             
-            missing_fields = [
-                field for field in required_fields
-                if field not in data
-            ]
-            
-            if missing_fields:
+            if not has_required_fields(data):
+                missing_fields = [
+                    field for field in required_fields
+                    if field not in data
+                ]
                 raise ValidationError(
                     "Missing required fields",
                     payload={'missing_fields': missing_fields}
@@ -393,7 +537,54 @@ def require_fields(*required_fields):
             
             return f(*args, **kwargs)
         
-        return decorated_function
+        return _wrap(decorated_function, f)
+    return decorator
+
+
+def json_request(*required_fields):
+    """
+    Decorator combining validate_json_request and require_fields.
+    
+    Parses the body once and passes it to the view as the `json_data`
+    keyword argument, so the view does not call request.get_json() again.
+    
+    Args:
+        *required_fields: Field names that must be present
+        
+    Example:
+        @app.route('/api/predict', methods=['POST'])
+        @json_request('disease', 'symptoms')
+        def predict(json_data):
+            disease = json_data['disease']
+    """
+    has_required_fields = frozenset(required_fields).issubset
+    
+    def decorator(f):
+        def decorated_function(*args, **kwargs):
+            if not request.is_json:
+                raise ValidationError(
+                    "Request must be JSON",
+                    content_type=request.content_type
+                )
+            
+            data = request.get_json(silent=True)
+            if not data:
+                raise ValidationError("Invalid JSON: request body is empty or malformed")
+            
+            if not has_required_fields(data):
+                missing_fields = [
+                    field for field in required_fields
+                    if field not in data
+                ]
+                raise ValidationError(
+                    "Missing required fields",
+                    missing_fields=missing_fields
+                )
+            
+            kwargs['json_data'] = data
+            return f(*args, **kwargs)
+        
+        return _wrap(decorated_function, f)
     return decorator
 
 
@@ -407,11 +598,15 @@ def success_response(data=None, message=None, status_code=200):
         status_code: HTTP status code
         
     Returns:
-        JSON response
+        Tuple of (JSON response, status code), as returned by views
     """
+    # Fast path: constant body, only the timestamp varies
+    if data is None and not message:
+        return _static_json_response(_SUCCESS_PREFIX, status_code), status_code
+    
     response_data = {
         'success': True,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': _now_iso()
     }
     
     if message:
@@ -420,7 +615,7 @@ def success_response(data=None, message=None, status_code=200):
     if data is not None:
         response_data['data'] = data
     
-    return jsonify(response_data), status_code
+    return _json_response(response_data, status_code), status_code
 
 
 def error_response(message, status_code=400, **kwargs):
@@ -433,14 +628,18 @@ def error_response(message, status_code=400, **kwargs):
         **kwargs: Additional error data
         
     Returns:
-        JSON response
+        Tuple of (JSON response, status code), as returned by views
     """
+    # Fast path: body serialized once per distinct message
+    if not kwargs and isinstance(message, str):
+        return _static_json_response(_error_prefix(message), status_code), status_code
+    
     response_data = {
         'success': False,
         'error': message,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': _now_iso()
     }
     
     response_data.update(kwargs)
     
-    return jsonify(response_data), status_code
+    return _json_response(response_data, status_code), status_code
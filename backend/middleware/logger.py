@@ -4,14 +4,79 @@ Provides comprehensive logging for debugging, monitoring, and auditing
 """
 
 import logging
-import json
-from datetime import datetime
+import orjson
 from functools import wraps
-from flask import request, g
+from flask import request, g, has_request_context
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import itertools
+import queue
 import time
 import os
 
 
+_log = logging.getLogger(__name__)
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that writes through a 64 KB buffer.
+    
+    Records are not flushed one by one; the buffer is written out when it
+    fills, when _BatchFlushingListener has drained its queue, or when the
+    handler is closed.
+    """
+    
+    buffer_size = 64 * 1024
+    
+    def _open(self):
+        return open(
+            self.baseFilename, self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+    
+    def flush(self):
+        # StreamHandler.emit() flushes after every record; batches are
+        # written out by flush_batch() instead
+        pass
+    
+    def flush_batch(self):
+        """Write the buffered records to disk."""
+        logging.StreamHandler.flush(self)
+
+
+class _BatchFlushingListener(QueueListener):
+    """
+    Queue listener that flushes its handlers whenever the queue runs empty.
+    
+    A burst of records is written with one flush per file, and a record
+    logged on an idle worker still reaches disk right away.
+    """
+    
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush_batch()
+        return self.queue.get(block)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Queue handler that keeps exc_info and extra fields on the record.
+    
+    The stock QueueHandler formats the record on the calling thread and
+    drops exc_info; here only the message is resolved so JsonFormatter can
+    still serialize the exception and extra fields on the listener thread.
+    """
+    
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 class StructuredLogger:
     """
     Structured logger with JSON formatting and multiple log levels.
@@ -43,7 +108,7 @@ class StructuredLogger:
         self._add_console_handler()
         self._add_file_handlers()
         
-        print(f"✅ StructuredLogger initialized: {name}")
+        _log.debug("StructuredLogger initialized: %s", name)
     
     def _add_console_handler(self):
         """Add console handler with colored output."""
@@ -60,30 +125,41 @@ class StructuredLogger:
         self.logger.addHandler(console_handler)
     
     def _add_file_handlers(self):
-        """Add file handlers for different log levels."""
-        # All logs
-        all_handler = logging.FileHandler(
-            os.path.join(self.log_dir, 'app.log')
-        )
-        all_handler.setLevel(logging.DEBUG)
-        all_handler.setFormatter(self._get_json_formatter())
-        self.logger.addHandler(all_handler)
-        
-        # Error logs
-        error_handler = logging.FileHandler(
-            os.path.join(self.log_dir, 'error.log')
-        )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(self._get_json_formatter())
-        self.logger.addHandler(error_handler)
+        """
+        Add file handlers for different log levels.
         
-        # API logs
-        api_handler = logging.FileHandler(
-            os.path.join(self.log_dir, 'api.log')
-        )
-        api_handler.setLevel(logging.INFO)
-        api_handler.setFormatter(self._get_json_formatter())
-        self.logger.addHandler(api_handler)
+        The file handlers run on a background QueueListener; request threads
+        only put records on the queue.
+        """
+        file_handlers = []
+        
+        # All logs, error logs, API logs
+        for filename, level in (
+            ('app.log', logging.DEBUG),
+            ('error.log', logging.ERROR),
+            ('api.log', logging.INFO),
+        ):
+            handler = _BufferedFileHandler(os.path.join(self.log_dir, filename))
+            handler.setLevel(level)
+            handler.setFormatter(self._get_json_formatter())
+            file_handlers.append(handler)
+        
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(_ContextQueueHandler(log_queue))
+        
+        self._file_handlers = file_handlers
+        self._listener = _BatchFlushingListener(log_queue, *file_handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.shutdown)
+    
+    def shutdown(self):
+        """Drain queued records and close the log files."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+        for handler in self._file_handlers:
+            handler.close()
     
     def _get_json_formatter(self):
         """Get JSON formatter for structured logging."""
@@ -102,43 +178,54 @@ class StructuredLogger:
         context = extra or {}
         
         # Add request context if available
-        try:
-            if request:
-                context.update({
+        if has_request_context():
+            # Resolved once per request and reused by later log calls
+            log_ctx = g.get('_log_ctx')
+            if log_ctx is None:
+                log_ctx = g._log_ctx = {
                     'path': request.path,
                     'method': request.method,
                     'remote_addr': request.remote_addr,
                     'user_agent': request.headers.get('User-Agent', 'Unknown')
-                })
-                
-                # Add request ID if available
-                if hasattr(g, 'request_id'):
-                    context['request_id'] = g.request_id
-        except RuntimeError:
-            # Outside request context
-            pass
+                }
+            context.update(log_ctx)
+            
+            # Add request ID if available
+            request_id = g.get('request_id')
+            if request_id is not None:
+                context['request_id'] = request_id
         
         return context
     
     def debug(self, message, **kwargs):
         """Log debug message."""
-        self.logger.debug(message, extra=self._add_context(kwargs))
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(message, extra={'_ctx': self._add_context(kwargs)})
     
     def info(self, message, **kwargs):
         """Log info message."""
-        self.logger.info(message, extra=self._add_context(kwargs))
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(message, extra={'_ctx': self._add_context(kwargs)})
     
     def warning(self, message, **kwargs):
         """Log warning message."""
-        self.logger.warning(message, extra=self._add_context(kwargs))
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        self.logger.warning(message, extra={'_ctx': self._add_context(kwargs)})
     
     def error(self, message, **kwargs):
         """Log error message."""
-        self.logger.error(message, extra=self._add_context(kwargs))
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        self.logger.error(message, extra={'_ctx': self._add_context(kwargs)})
     
     def critical(self, message, **kwargs):
         """Log critical message."""
-        self.logger.critical(message, extra=self._add_context(kwargs))
+        if not self.logger.isEnabledFor(logging.CRITICAL):
+            return
+        self.logger.critical(message, extra={'_ctx': self._add_context(kwargs)})
     
     def log_api_request(self, endpoint, method, status_code, duration, **kwargs):
         """
@@ -151,12 +238,14 @@ class StructuredLogger:
             duration: Request duration in seconds
             **kwargs: Additional data
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(
             f"API Request: {method} {endpoint}",
             endpoint=endpoint,
             method=method,
             status_code=status_code,
-            duration_ms=round(duration * 1000, 2),
+            duration_ms=duration * 1000,
             **kwargs
         )
     
@@ -166,18 +255,27 @@ class StructuredLogger:
         
         Args:
             disease: Disease name
-            symptoms: List of symptoms
+            symptoms: List of symptoms, or a NumPy 0/1 symptom indicator vector
             probability: Prediction probability
             duration: Prediction duration in seconds
             **kwargs: Additional data
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        # Indicator vectors count their active symptoms, not their length
+        if hasattr(symptoms, 'sum'):
+            symptoms_count = int(symptoms.sum())
+        else:
+            symptoms_count = len(symptoms)
+        
         self.info(
             f"Prediction: {disease}",
             event_type='prediction',
             disease=disease,
-            symptoms_count=len(symptoms),
-            probability=round(probability, 4),
-            duration_ms=round(duration * 1000, 2),
+            symptoms_count=symptoms_count,
+            probability=probability,
+            duration_ms=duration * 1000,
             **kwargs
         )
     
@@ -207,6 +305,8 @@ class StructuredLogger:
             severity: Event severity
             **kwargs: Additional data
         """
+        if not self.logger.isEnabledFor(getattr(logging, severity.upper(), logging.WARNING)):
+            return
         log_func = getattr(self, severity, self.warning)
         log_func(
             f"Security: {event_type}",
@@ -217,11 +317,41 @@ class StructuredLogger:
         )
 
 
+# LogRecord attributes that are not user-supplied extra fields, taken from a
+# blank record so attributes added by newer Python versions are covered too.
+# 'message' and 'asctime' are set later by Formatter.format().
+_RESERVED_RECORD_FIELDS = frozenset(
+    logging.LogRecord('', 0, '', 0, '', None, None).__dict__
+) | {'message', 'asctime'}
+
+
 class JsonFormatter(logging.Formatter):
     """
     JSON formatter for structured logging.
     """
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Second-resolution timestamp prefix, reused until the second changes
+        self._last_second = None
+        self._last_prefix = None
+    
+    def _timestamp(self, record):
+        """
+        Format the record creation time as an ISO 8601 UTC string.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            Timestamp string with millisecond precision
+        """
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._last_second = second
+        return '%s.%03dZ' % (self._last_prefix, record.msecs)
+    
     def format(self, record):
         """
         Format log record as JSON.
@@ -233,33 +363,48 @@ class JsonFormatter(logging.Formatter):
             JSON string
         """
         log_data = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': self._timestamp(record),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
         }
         
-        # Add extra fields
-        if hasattr(record, '__dict__'):
+        # Add extra fields: StructuredLogger passes its context as a single
+        # dict; other loggers' extra= fields are picked out of the record
+        context = getattr(record, '_ctx', None)
+        if context is not None:
+            log_data.update(context)
+        else:
             for key, value in record.__dict__.items():
-                if key not in ['name', 'msg', 'args', 'created', 'filename', 
-                              'funcName', 'levelname', 'levelno', 'lineno', 
-                              'module', 'msecs', 'message', 'pathname', 
-                              'process', 'processName', 'relativeCreated', 
-                              'thread', 'threadName', 'exc_info', 'exc_text',
-                              'stack_info']:
+                if key not in _RESERVED_RECORD_FIELDS:
                     log_data[key] = value
         
         # Add exception info if present
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode()
 
 
 # Global logger instance
 _global_logger = None
 
+# Monotonic per-process request counter
+_request_counter = itertools.count()
+
+
+def _get_request_id():
+    """
+    Get the ID of the current request, assigning one on first use.
+    
+    Returns:
+        Request ID string
+    """
+    request_id = g.get('request_id')
+    if request_id is None:
+        request_id = g.request_id = f"{next(_request_counter)}-{request.remote_addr}"
+    return request_id
+
 
 def get_logger(name='disease_prediction'):
     """
@@ -293,9 +438,8 @@ def log_request(f):
     def decorated_function(*args, **kwargs):
         logger = get_logger()
         
-        # Generate request ID
-        request_id = f"{int(time.time() * 1000)}-{request.remote_addr}"
-        g.request_id = request_id
+        # Reuse the RequestLogger's request ID if it already assigned one
+        request_id = _get_request_id()
         
         # Log request start
         logger.debug(
@@ -304,10 +448,10 @@ def log_request(f):
         )
         
         # Execute function
-        start_time = time.time()
+        start_time = time.monotonic()
         try:
             response = f(*args, **kwargs)
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             
             # Get status code
             status_code = 200
@@ -316,19 +460,20 @@ def log_request(f):
             elif isinstance(response, tuple) and len(response) > 1:
                 status_code = response[1]
             
-            # Log successful request
-            logger.log_api_request(
-                endpoint=request.path,
-                method=request.method,
-                status_code=status_code,
-                duration=duration,
-                request_id=request_id
-            )
+            # Log successful request, unless RequestLogger will log it
+            if 'start_time' not in g:
+                logger.log_api_request(
+                    endpoint=request.path,
+                    method=request.method,
+                    status_code=status_code,
+                    duration=duration,
+                    request_id=request_id
+                )
             
             return response
             
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             
             # Log failed request
             logger.log_error(
@@ -349,32 +494,37 @@ def log_prediction_request(f):
     """
     Decorator to log prediction requests.
     
+    The probability is read from ``g.prediction_result`` (or from the view's
+    return value when it is a plain dict), so the response body is never
+    parsed again just for logging.
+    
     Example:
         @app.route('/api/predict')
         @log_prediction_request
         def predict():
-            pass
+            g.prediction_result = result
+            return success_response(result)
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
         logger = get_logger()
         
         # Get request data
-        data = request.get_json() if request.is_json else {}
+        data = request.get_json(silent=True, cache=True) if request.is_json else None
+        data = data if isinstance(data, dict) else {}
         disease = data.get('disease', 'unknown')
         symptoms = data.get('symptoms', [])
         
         # Execute function
-        start_time = time.time()
+        start_time = time.monotonic()
         response = f(*args, **kwargs)
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         
-        # Extract probability from response
-        probability = 0.0
-        if hasattr(response, 'get_json'):
-            response_data = response.get_json()
-            if isinstance(response_data, dict):
-                probability = response_data.get('probability', 0.0)
+        # Extract probability from the result dict the view produced
+        result = g.get('prediction_result')
+        if result is None and isinstance(response, dict):
+            result = response
+        probability = result.get('probability', 0.0) if result else 0.0
         
         # Log prediction
         logger.log_prediction(
@@ -429,12 +579,15 @@ class RequestLogger:
         app.before_request(self.before_request)
         app.after_request(self.after_request)
         
-        print("✅ RequestLogger initialized")
+        # Create the logger now rather than on the first request
+        get_logger()
+        
+        _log.debug("RequestLogger initialized")
     
     def before_request(self):
         """Log before request."""
-        g.start_time = time.time()
-        g.request_id = f"{int(time.time() * 1000)}-{request.remote_addr}"
+        g.start_time = time.monotonic()
+        _get_request_id()
     
     def after_request(self, response):
         """
@@ -447,7 +600,7 @@ class RequestLogger:
             Response object
         """
         if hasattr(g, 'start_time'):
-            duration = time.time() - g.start_time
+            duration = time.monotonic() - g.start_time
             
             logger = get_logger()
             logger.log_api_request(
@@ -1,10 +1,152 @@
+import math
 import numpy as np
+from bisect import bisect_right
+from functools import lru_cache
 from typing import List, Dict, Tuple
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy kernel below is used as-is
+    njit = None
+
+
+def _score_all(symptom_weights: np.ndarray, symptom_mask: np.ndarray, bias: np.ndarray, indices: np.ndarray):
+    """
+    Score every disease for one set of symptom indices.
+
+    Only the rows of the reported symptoms are read and summed, rather than
+    multiplying the full matrix by a mostly-zero indicator vector.
+
+    Returns:
+        Tuple of (raw probabilities, calibrated probabilities, matched symptom counts)
+    """
+    # Weights are stored as float32; accumulate in float64
+    z = symptom_weights[indices].astype(np.float64).sum(axis=0) + bias
+    # Raw and temperature-scaled (T=1.8) sigmoids from a single exp sweep
+    probabilities = 1 / (1 + np.exp(np.stack((-z, -(z / 1.8)))))
+    return probabilities[0], probabilities[1], symptom_mask[indices].sum(axis=0)
+
+
+# BMI buckets: < 18.5, < 25, < 30, >= 30
+_BMI_EDGES = (18.5, 25, 30)
+_BMI_EFFECTS = (0.25, 0.0, 0.35, 0.6)  # underweight, normal, overweight, obese
+_BMI_CATEGORIES = ("Underweight", "Normal", "Overweight", "Obese")
+
+
+_NUMBA_AVAILABLE = njit is not None
+if _NUMBA_AVAILABLE:
+    _score_all = njit(cache=True)(_score_all)
+
+
+# Symptom weights for each disease (trained coefficients)
+DISEASE_WEIGHTS = {
+    'diabetes': {'symptoms': {'increased_thirst': 0.85, 'frequent_urination': 0.90, 'extreme_hunger': 0.75, 'unexplained_weight_loss': 0.80, 'fatigue': 0.60, 'blurred_vision': 0.70, 'slow_healing_sores': 0.65, 'frequent_infections': 0.60, 'tingling_hands_feet': 0.70, 'darkened_skin': 0.55}, 'bias': -2.5},
+    'hypertension': {'symptoms': {'severe_headache': 0.75, 'chest_pain': 0.85, 'difficulty_breathing': 0.80, 'irregular_heartbeat': 0.90, 'blood_in_urine': 0.70, 'pounding_sensation': 0.65, 'vision_problems': 0.60, 'fatigue': 0.50, 'dizziness': 0.70, 'nosebleeds': 0.55}, 'bias': -2.8},
+    'covid19': {'symptoms': {'fever': 0.80, 'dry_cough': 0.85, 'fatigue': 0.70, 'loss_taste_smell': 0.95, 'sore_throat': 0.60, 'headache': 0.65, 'body_aches': 0.70, 'difficulty_breathing': 0.90, 'chest_pain': 0.75, 'confusion': 0.80}, 'bias': -3.0},
+    'heart_disease': {'symptoms': {'chest_pain': 0.90, 'shortness_breath': 0.85, 'pain_arms_neck': 0.75, 'dizziness': 0.65, 'rapid_heartbeat': 0.80, 'fatigue': 0.60, 'swelling_legs': 0.70, 'cold_sweats': 0.75, 'nausea': 0.55, 'jaw_pain': 0.70}, 'bias': -2.7},
+    
+    # --- Expanded CSV Diseases ---
+    'influenza': {'symptoms': {'fever': 0.85, 'chills': 0.80, 'muscle_aches': 0.85, 'cough': 0.75, 'congestion': 0.70, 'runny_nose': 0.70, 'headache': 0.75, 'fatigue': 0.80}, 'bias': -2.0},
+    'malaria': {'symptoms': {'fever': 0.90, 'chills': 0.90, 'headache': 0.75, 'nausea': 0.70, 'vomiting': 0.70, 'muscle_pain': 0.80, 'fatigue': 0.75, 'sweating': 0.85}, 'bias': -2.2},
+    'diabetes_type_2': {'symptoms': {'increased_thirst': 0.85, 'frequent_urination': 0.90, 'hunger': 0.75, 'fatigue': 0.70, 'blurred_vision': 0.65}, 'bias': -2.5},
+    'breast_cancer': {'symptoms': {'breast_lump': 0.95, 'breast_pain': 0.70, 'nipple_discharge': 0.80, 'skin_changes': 0.75, 'swollen_lymph_nodes': 0.70}, 'bias': -4.0},
+    'lung_cancer': {'symptoms': {'persistent_cough': 0.90, 'coughing_blood': 0.95, 'chest_pain': 0.80, 'shortness_breath': 0.85, 'weight_loss': 0.75}, 'bias': -4.0},
+    'colorectal_cancer': {'symptoms': {'change_bowel_habits': 0.85, 'blood_in_stool': 0.95, 'abdominal_pain': 0.75, 'weight_loss': 0.70, 'fatigue': 0.65}, 'bias': -4.0},
+    'prostate_cancer': {'symptoms': {'difficulty_urinating': 0.85, 'blood_in_urine': 0.90, 'pelvic_pain': 0.70, 'bone_pain': 0.60}, 'bias': -4.0},
+    'stroke': {'symptoms': {'numbness_face_arm_leg': 0.95, 'confusion': 0.90, 'trouble_speaking': 0.95, 'trouble_seeing': 0.85, 'severe_headache': 0.80, 'dizziness': 0.75}, 'bias': -3.0},
+    'pneumonia': {'symptoms': {'cough_phlegm': 0.90, 'fever': 0.85, 'chills': 0.80, 'difficulty_breathing': 0.90, 'chest_pain': 0.85, 'fatigue': 0.75}, 'bias': -2.5},
+    'tuberculosis': {'symptoms': {'persistent_cough': 0.90, 'coughing_blood': 0.95, 'chest_pain': 0.75, 'fever': 0.70, 'night_sweats': 0.85, 'weight_loss': 0.80}, 'bias': -3.0},
+    'hepatitis_b': {'symptoms': {'yellow_skin_eyes': 0.95, 'dark_urine': 0.85, 'fatigue': 0.80, 'nausea': 0.75, 'abdominal_pain': 0.70}, 'bias': -3.0},
+    'hepatitis_c': {'symptoms': {'yellow_skin_eyes': 0.90, 'dark_urine': 0.80, 'fatigue': 0.85, 'loss_appetite': 0.75, 'nausea': 0.70}, 'bias': -3.0},
+    'hiv_aids': {'symptoms': {'fever': 0.80, 'chills': 0.75, 'rash': 0.70, 'night_sweats': 0.85, 'muscle_aches': 0.75, 'sore_throat': 0.70, 'swollen_lymph_nodes': 0.90}, 'bias': -3.5},
+    'alzheimers_disease': {'symptoms': {'memory_loss': 0.95, 'difficulty_planning': 0.85, 'confusion_time_place': 0.90, 'misplacing_items': 0.80, 'mood_changes': 0.75}, 'bias': -3.5},
+    'parkinsons_disease': {'symptoms': {'tremor': 0.95, 'slowed_movement': 0.90, 'rigid_muscles': 0.85, 'impaired_posture': 0.80, 'loss_automatic_movements': 0.75}, 'bias': -3.5},
+    'multiple_sclerosis': {'symptoms': {'numbness_weakness': 0.90, 'vision_problems': 0.85, 'tingling': 0.80, 'fatigue': 0.85, 'dizziness': 0.75}, 'bias': -3.5},
+    'epilepsy': {'symptoms': {'seizures': 0.99, 'confusion': 0.75, 'staring_spell': 0.80, 'uncontrollable_jerking': 0.90, 'loss_consciousness': 0.85}, 'bias': -3.0},
+    'asthma': {'symptoms': {'shortness_breath': 0.90, 'chest_tightness': 0.85, 'wheezing': 0.95, 'coughing_at_night': 0.80}, 'bias': -2.5},
+    'copd': {'symptoms': {'shortness_breath': 0.90, 'wheezing': 0.85, 'chest_tightness': 0.80, 'chronic_cough': 0.90, 'frequent_infections': 0.75}, 'bias': -2.8},
+    'kidney_disease': {'symptoms': {'fatigue': 0.80, 'swollen_ankles': 0.85, 'poor_appetite': 0.75, 'puffy_eyes': 0.70, 'frequent_urination': 0.80}, 'bias': -3.0},
+    'liver_disease': {'symptoms': {'yellow_skin_eyes': 0.95, 'abdominal_pain': 0.80, 'swelling_legs': 0.75, 'dark_urine': 0.85, 'chronic_fatigue': 0.80}, 'bias': -3.0},
+    'osteoarthritis': {'symptoms': {'joint_pain': 0.90, 'stiffness': 0.85, 'tenderness': 0.80, 'loss_flexibility': 0.75, 'grating_sensation': 0.70}, 'bias': -2.5},
+    'rheumatoid_arthritis': {'symptoms': {'tender_joints': 0.90, 'joint_stiffness': 0.90, 'fatigue': 0.80, 'fever': 0.60, 'loss_appetite': 0.70}, 'bias': -3.0},
+    'osteoporosis': {'symptoms': {'back_pain': 0.80, 'loss_height': 0.85, 'stooped_posture': 0.80, 'bone_fracture': 0.90}, 'bias': -2.8},
+    'migraine': {'symptoms': {'severe_headache': 0.95, 'sensitivity_light': 0.90, 'sensitivity_sound': 0.85, 'nausea': 0.80, 'vomiting': 0.75}, 'bias': -2.0},
+    'depression': {'symptoms': {'persistent_sadness': 0.95, 'loss_interest': 0.90, 'sleep_disturbances': 0.85, 'fatigue': 0.80, 'anxiety': 0.75}, 'bias': -2.5},
+    'anxiety_disorder': {'symptoms': {'nervousness': 0.90, 'panic': 0.85, 'rapid_heartbeat': 0.80, 'trembling': 0.75, 'fatigue': 0.70}, 'bias': -2.5},
+    'bipolar_disorder': {'symptoms': {'mood_swings': 0.95, 'high_energy': 0.90, 'low_energy': 0.90, 'sleep_problems': 0.80}, 'bias': -3.0},
+    'schizophrenia': {'symptoms': {'delusions': 0.95, 'hallucinations': 0.95, 'disorganized_speech': 0.90, 'abnormal_behavior': 0.85}, 'bias': -3.5},
+    'celiac_disease': {'symptoms': {'diarrhea': 0.90, 'fatigue': 0.85, 'weight_loss': 0.80, 'bloating': 0.85, 'abdominal_pain': 0.80}, 'bias': -3.0},
+    'crohns_disease': {'symptoms': {'diarrhea': 0.90, 'fever': 0.75, 'fatigue': 0.80, 'abdominal_pain': 0.85, 'blood_in_stool': 0.80}, 'bias': -3.0},
+    'ulcerative_colitis': {'symptoms': {'diarrhea_blood': 0.95, 'abdominal_pain': 0.85, 'rectal_pain': 0.80, 'weight_loss': 0.75, 'fatigue': 0.70}, 'bias': -3.0},
+    'gout': {'symptoms': {'intense_joint_pain': 0.95, 'lingering_discomfort': 0.80, 'inflammation': 0.85, 'limited_range_motion': 0.75}, 'bias': -2.5},
+    'psoriasis': {'symptoms': {'red_patches_skin': 0.95, 'scaling_spots': 0.90, 'dry_cracked_skin': 0.80, 'itching': 0.75, 'swollen_joints': 0.70}, 'bias': -2.5},
+    'lupus': {'symptoms': {'fatigue': 0.90, 'joint_pain': 0.85, 'butterfly_rash': 0.95, 'fever': 0.75, 'sensitivity_light': 0.80}, 'bias': -3.5},
+    'fibromyalgia': {'symptoms': {'widespread_pain': 0.95, 'fatigue': 0.90, 'cognitive_difficulties': 0.80, 'sleep_problems': 0.85}, 'bias': -3.0},
+    'iron_deficiency_anemia': {'symptoms': {'extreme_fatigue': 0.90, 'weakness': 0.85, 'pale_skin': 0.80, 'chest_pain': 0.75, 'cold_hands_feet': 0.70}, 'bias': -2.5},
+    'vitamin_d_deficiency': {'symptoms': {'fatigue': 0.80, 'bone_pain': 0.85, 'muscle_weakness': 0.80, 'mood_changes': 0.70}, 'bias': -2.0},
+    'hypothyroidism': {'symptoms': {'fatigue': 0.90, 'increased_sensitivity_cold': 0.85, 'constipation': 0.80, 'dry_skin': 0.75, 'weight_gain': 0.80}, 'bias': -2.5},
+    'hyperthyroidism': {'symptoms': {'unintentional_weight_loss': 0.90, 'rapid_heartbeat': 0.85, 'increased_appetite': 0.80, 'nervousness': 0.80, 'sweating': 0.75}, 'bias': -2.5},
+    'adrenal_insufficiency': {'symptoms': {'fatigue': 0.90, 'muscle_weakness': 0.85, 'loss_appetite': 0.80, 'weight_loss': 0.80, 'abdominal_pain': 0.75}, 'bias': -3.5},
+    'pituitary_disorders': {'symptoms': {'headache': 0.80, 'vision_problems': 0.85, 'fatigue': 0.80, 'mood_changes': 0.75, 'infertility': 0.70}, 'bias': -4.0},
+    'glaucoma': {'symptoms': {'blind_spots': 0.90, 'tunnel_vision': 0.85, 'severe_headache': 0.80, 'eye_pain': 0.85, 'blurred_vision': 0.80}, 'bias': -3.0},
+    'cataracts': {'symptoms': {'clouded_vision': 0.95, 'sensitivity_light': 0.85, 'difficulty_seeing_night': 0.90, 'fading_colors': 0.80, 'double_vision': 0.75}, 'bias': -2.5},
+    'macular_degeneration': {'symptoms': {'partial_vision_loss': 0.95, 'straight_lines_appear_wavy': 0.90, 'blurred_vision': 0.85, 'difficulty_adapting_low_light': 0.80}, 'bias': -3.0},
+    'hearing_loss': {'symptoms': {'muffling_speech': 0.90, 'difficulty_understanding_words': 0.85, 'trouble_hearing_consonants': 0.80, 'asking_others_speak_slowly': 0.75}, 'bias': -2.5},
+    'tinnitus': {'symptoms': {'ringing_ears': 0.95, 'buzzing_ears': 0.90, 'roaring_ears': 0.85, 'clicking_ears': 0.80}, 'bias': -2.5},
+    'sleep_apnea': {'symptoms': {'loud_snoring': 0.90, 'stop_breathing_sleep': 0.95, 'gasping_air_sleep': 0.90, 'morning_headache': 0.75, 'daytime_sleepiness': 0.85}, 'bias': -2.5},
+    'insomnia': {'symptoms': {'difficulty_falling_asleep': 0.95, 'waking_up_night': 0.90, 'waking_up_early': 0.85, 'daytime_tiredness': 0.80}, 'bias': -2.0},
+    'gerd': {'symptoms': {'heartburn': 0.95, 'chest_pain': 0.80, 'difficulty_swallowing': 0.85, 'regurgitation': 0.90, 'sensation_lump_throat': 0.75}, 'bias': -2.0},
+    'ibs': {'symptoms': {'abdominal_pain': 0.85, 'bloating': 0.80, 'gas': 0.80, 'diarrhea': 0.75, 'constipation': 0.75}, 'bias': -2.0},
+    'gallstones': {'symptoms': {'sudden_intense_pain_abdomen': 0.95, 'back_pain': 0.80, 'nausea': 0.75, 'vomiting': 0.75, 'digestive_problems': 0.70}, 'bias': -2.8},
+    'kidney_stones': {'symptoms': {'severe_pain_side_back': 0.95, 'pain_urination': 0.90, 'pink_red_brown_urine': 0.85, 'nausea': 0.80, 'frequent_urination': 0.75}, 'bias': -2.8},
+    'uti': {'symptoms': {'strong_urge_urinate': 0.90, 'burning_sensation_urination': 0.95, 'cloudy_urine': 0.85, 'red_pink_urine': 0.80, 'pelvic_pain': 0.75}, 'bias': -2.0},
+    'benign_prostatic_hyperplasia': {'symptoms': {'frequent_urination': 0.90, 'trouble_starting_urination': 0.85, 'weak_urine_stream': 0.85, 'dribbling_urination': 0.80}, 'bias': -2.5},
+    'endometriosis': {'symptoms': {'painful_periods': 0.95, 'pain_intercourse': 0.85, 'pain_bowel_movements': 0.80, 'excessive_bleeding': 0.75, 'infertility': 0.70}, 'bias': -3.0},
+    'pcos': {'symptoms': {'irregular_periods': 0.95, 'excess_androgen': 0.90, 'polycystic_ovaries': 0.95, 'weight_gain': 0.80, 'acne': 0.75}, 'bias': -3.0},
+    'preeclampsia': {'symptoms': {'high_blood_pressure': 0.95, 'severe_headaches': 0.90, 'changes_vision': 0.85, 'swelling_face_hands': 0.80}, 'bias': -3.5},
+    'gestational_diabetes': {'symptoms': {'increased_thirst': 0.85, 'frequent_urination': 0.90, 'fatigue': 0.75, 'nausea': 0.70}, 'bias': -2.8},
+    'myocardial_infarction': {'symptoms': {'chest_pain': 0.95, 'shortness_breath': 0.90, 'cold_sweat': 0.85, 'fatigue': 0.80, 'nausea': 0.75}, 'bias': -3.0},
+    'atrial_fibrillation': {'symptoms': {'palpitations': 0.95, 'weakness': 0.85, 'fatigue': 0.85, 'lightheadedness': 0.80, 'shortness_breath': 0.75}, 'bias': -2.8},
+    'heart_failure': {'symptoms': {'shortness_breath': 0.95, 'fatigue': 0.90, 'swollen_legs': 0.90, 'rapid_heartbeat': 0.85, 'persistent_cough': 0.80}, 'bias': -3.0},
+    'peripheral_artery_disease': {'symptoms': {'leg_pain_walking': 0.90, 'leg_numbness': 0.85, 'cold_legs': 0.80, 'sores_toes': 0.75, 'shiny_skin_legs': 0.70}, 'bias': -3.0},
+    'deep_vein_thrombosis': {'symptoms': {'swelling_leg': 0.95, 'pain_leg': 0.90, 'red_skin_leg': 0.85, 'warmth_leg': 0.85}, 'bias': -3.5},
+    'pulmonary_embolism': {'symptoms': {'shortness_breath': 0.95, 'chest_pain': 0.90, 'cough': 0.80, 'faintness': 0.85, 'rapid_pulse': 0.85}, 'bias': -3.5},
+    'sepsis': {'symptoms': {'fever': 0.90, 'low_body_temperature': 0.85, 'rapid_heart_rate': 0.90, 'rapid_breathing': 0.90, 'confusion': 0.85}, 'bias': -4.0},
+    'meningitis': {'symptoms': {'high_fever': 0.90, 'stiff_neck': 0.95, 'severe_headache': 0.90, 'nausea': 0.80, 'confusion': 0.85, 'sensitivity_light': 0.80}, 'bias': -4.5},
+    'encephalitis': {'symptoms': {'headache': 0.90, 'fever': 0.85, 'muscle_aches': 0.80, 'confusion': 0.90, 'seizures': 0.85}, 'bias': -4.5},
+    'appendicitis': {'symptoms': {'pain_lower_right_abdomen': 0.99, 'nausea': 0.85, 'vomiting': 0.80, 'loss_appetite': 0.75, 'fever': 0.70}, 'bias': -3.0},
+    'cholecystitis': {'symptoms': {'severe_pain_upper_right_abdomen': 0.95, 'pain_radiating_shoulder': 0.85, 'tenderness_abdomen': 0.90, 'nausea': 0.80}, 'bias': -3.0},
+    'pancreatitis': {'symptoms': {'upper_abdominal_pain': 0.95, 'abdominal_pain_back': 0.90, 'tenderness_abdomen': 0.85, 'fever': 0.80, 'rapid_pulse': 0.80}, 'bias': -3.5},
+    'gastritis': {'symptoms': {'gnawing_pain_abdomen': 0.90, 'nausea': 0.85, 'vomiting': 0.80, 'fullness_abdomen': 0.80}, 'bias': -2.5},
+    'peptic_ulcer': {'symptoms': {'burning_stomach_pain': 0.95, 'feeling_full': 0.85, 'heartburn': 0.80, 'nausea': 0.75}, 'bias': -2.5},
+    'diverticulitis': {'symptoms': {'pain_abdominal': 0.90, 'nausea': 0.80, 'fever': 0.75, 'constipation': 0.70}, 'bias': -2.8},
+    'hemorrhoids': {'symptoms': {'itching_anal': 0.90, 'pain_anal': 0.85, 'swelling_anal': 0.80, 'bleeding_bowel_movements': 0.85}, 'bias': -2.0},
+    'hernia': {'symptoms': {'bulge_abdomen': 0.95, 'pain_lift_heavy': 0.90, 'ache_bulge': 0.85, 'nausea': 0.70}, 'bias': -2.5},
+    'fracture': {'symptoms': {'pain': 0.95, 'swelling': 0.90, 'bruising': 0.85, 'deformity': 0.95, 'inability_move': 0.90}, 'bias': -2.0},
+    'spinal_stenosis': {'symptoms': {'numbness_extremities': 0.85, 'weakness_extremities': 0.80, 'neck_pain': 0.75, 'balance_problems': 0.70}, 'bias': -3.0},
+    'herniated_disc': {'symptoms': {'arm_leg_pain': 0.90, 'numbness': 0.85, 'weakness': 0.80}, 'bias': -2.5},
+    'scoliosis': {'symptoms': {'uneven_shoulders': 0.95, 'uneven_waist': 0.90, 'one_hip_higher': 0.90}, 'bias': -2.5},
+    'tendonitis': {'symptoms': {'pain_tendon': 0.95, 'tenderness': 0.90, 'mild_swelling': 0.80}, 'bias': -2.0},
+    'bursitis': {'symptoms': {'aching_pain': 0.90, 'stiffness': 0.85, 'swollen_joint': 0.80, 'redness': 0.75}, 'bias': -2.0},
+    'carpal_tunnel_syndrome': {'symptoms': {'numbness_fingers': 0.95, 'weakness_hand': 0.85, 'tingling_fingers': 0.90}, 'bias': -2.2},
+    'plantar_fasciitis': {'symptoms': {'stabbing_pain_heel': 0.95, 'pain_morning': 0.90, 'pain_after_exercise': 0.80}, 'bias': -2.0},
+    'shingles': {'symptoms': {'pain_burning': 0.95, 'red_rash': 0.90, 'fluid_filled_blisters': 0.90, 'itching': 0.85}, 'bias': -2.8},
+    'herpes_simplex': {'symptoms': {'tingling_itching': 0.90, 'sores': 0.95, 'fever': 0.70, 'swollen_lymph_nodes': 0.75}, 'bias': -2.5},
+    'chickenpox': {'symptoms': {'itchy_rash': 0.99, 'fever': 0.85, 'fatigue': 0.80, 'loss_appetite': 0.75}, 'bias': -2.0},
+    'measles': {'symptoms': {'fever': 0.95, 'dry_cough': 0.85, 'runny_nose': 0.80, 'sore_throat': 0.75, 'inflamed_eyes': 0.80, 'koplik_spots': 0.95, 'skin_rash': 0.95}, 'bias': -3.0},
+    'mumps': {'symptoms': {'swollen_salivary_glands': 0.99, 'fever': 0.85, 'headache': 0.80, 'muscle_aches': 0.80, 'weakness': 0.75}, 'bias': -3.0},
+    'rubella': {'symptoms': {'mild_fever': 0.80, 'headache': 0.70, 'runny_nose': 0.70, 'inflamed_eyes': 0.70, 'pink_rash': 0.95, 'swollen_lymph_nodes': 0.85}, 'bias': -2.5},
+    'whooping_cough': {'symptoms': {'runny_nose': 0.80, 'nasal_congestion': 0.80, 'red_watery_eyes': 0.75, 'severe_cough': 0.95}, 'bias': -2.8},
+    'diptheria': {'symptoms': {'thick_gray_coating_throat': 0.99, 'sore_throat': 0.90, 'swollen_glands': 0.85, 'difficulty_breathing': 0.90}, 'bias': -3.5},
+    'tetanus': {'symptoms': {'jaw_cramping': 0.95, 'muscle_spasms': 0.90, 'painful_muscle_stiffness': 0.90, 'trouble_swallowing': 0.85}, 'bias': -4.0},
+    'polio': {'symptoms': {'fever': 0.80, 'sore_throat': 0.75, 'headache': 0.80, 'vomiting': 0.75, 'fatigue': 0.80, 'muscle_weakness': 0.90, 'meningitis': 0.85}, 'bias': -4.5},
+}
+
+
 class DiseaseMLModel:
     """
     Machine Learning model for disease prediction based on symptoms.
@@ -12,125 +154,94 @@ class DiseaseMLModel:
     """
     
     def __init__(self):
-        # Symptom weights for each disease (trained coefficients)
-        self.disease_weights = {
-            'diabetes': {'symptoms': {'increased_thirst': 0.85, 'frequent_urination': 0.90, 'extreme_hunger': 0.75, 'unexplained_weight_loss': 0.80, 'fatigue': 0.60, 'blurred_vision': 0.70, 'slow_healing_sores': 0.65, 'frequent_infections': 0.60, 'tingling_hands_feet': 0.70, 'darkened_skin': 0.55}, 'bias': -2.5},
-            'hypertension': {'symptoms': {'severe_headache': 0.75, 'chest_pain': 0.85, 'difficulty_breathing': 0.80, 'irregular_heartbeat': 0.90, 'blood_in_urine': 0.70, 'pounding_sensation': 0.65, 'vision_problems': 0.60, 'fatigue': 0.50, 'dizziness': 0.70, 'nosebleeds': 0.55}, 'bias': -2.8},
-            'covid19': {'symptoms': {'fever': 0.80, 'dry_cough': 0.85, 'fatigue': 0.70, 'loss_taste_smell': 0.95, 'sore_throat': 0.60, 'headache': 0.65, 'body_aches': 0.70, 'difficulty_breathing': 0.90, 'chest_pain': 0.75, 'confusion': 0.80}, 'bias': -3.0},
-            'heart_disease': {'symptoms': {'chest_pain': 0.90, 'shortness_breath': 0.85, 'pain_arms_neck': 0.75, 'dizziness': 0.65, 'rapid_heartbeat': 0.80, 'fatigue': 0.60, 'swelling_legs': 0.70, 'cold_sweats': 0.75, 'nausea': 0.55, 'jaw_pain': 0.70}, 'bias': -2.7},
-            
-            # --- Expanded CSV Diseases ---
-            'influenza': {'symptoms': {'fever': 0.85, 'chills': 0.80, 'muscle_aches': 0.85, 'cough': 0.75, 'congestion': 0.70, 'runny_nose': 0.70, 'headache': 0.75, 'fatigue': 0.80}, 'bias': -2.0},
-            'malaria': {'symptoms': {'fever': 0.90, 'chills': 0.90, 'headache': 0.75, 'nausea': 0.70, 'vomiting': 0.70, 'muscle_pain': 0.80, 'fatigue': 0.75, 'sweating': 0.85}, 'bias': -2.2},
-            'diabetes_type_2': {'symptoms': {'increased_thirst': 0.85, 'frequent_urination': 0.90, 'hunger': 0.75, 'fatigue': 0.70, 'blurred_vision': 0.65}, 'bias': -2.5},
-            'breast_cancer': {'symptoms': {'breast_lump': 0.95, 'breast_pain': 0.70, 'nipple_discharge': 0.80, 'skin_changes': 0.75, 'swollen_lymph_nodes': 0.70}, 'bias': -4.0},
-            'lung_cancer': {'symptoms': {'persistent_cough': 0.90, 'coughing_blood': 0.95, 'chest_pain': 0.80, 'shortness_breath': 0.85, 'weight_loss': 0.75}, 'bias': -4.0},
-            'colorectal_cancer': {'symptoms': {'change_bowel_habits': 0.85, 'blood_in_stool': 0.95, 'abdominal_pain': 0.75, 'weight_loss': 0.70, 'fatigue': 0.65}, 'bias': -4.0},
-            'prostate_cancer': {'symptoms': {'difficulty_urinating': 0.85, 'blood_in_urine': 0.90, 'pelvic_pain': 0.70, 'bone_pain': 0.60}, 'bias': -4.0},
-            'stroke': {'symptoms': {'numbness_face_arm_leg': 0.95, 'confusion': 0.90, 'trouble_speaking': 0.95, 'trouble_seeing': 0.85, 'severe_headache': 0.80, 'dizziness': 0.75}, 'bias': -3.0},
-            'pneumonia': {'symptoms': {'cough_phlegm': 0.90, 'fever': 0.85, 'chills': 0.80, 'difficulty_breathing': 0.90, 'chest_pain': 0.85, 'fatigue': 0.75}, 'bias': -2.5},
-            'tuberculosis': {'symptoms': {'persistent_cough': 0.90, 'coughing_blood': 0.95, 'chest_pain': 0.75, 'fever': 0.70, 'night_sweats': 0.85, 'weight_loss': 0.80}, 'bias': -3.0},
-            'hepatitis_b': {'symptoms': {'yellow_skin_eyes': 0.95, 'dark_urine': 0.85, 'fatigue': 0.80, 'nausea': 0.75, 'abdominal_pain': 0.70}, 'bias': -3.0},
-            'hepatitis_c': {'symptoms': {'yellow_skin_eyes': 0.90, 'dark_urine': 0.80, 'fatigue': 0.85, 'loss_appetite': 0.75, 'nausea': 0.70}, 'bias': -3.0},
-            'hiv_aids': {'symptoms': {'fever': 0.80, 'chills': 0.75, 'rash': 0.70, 'night_sweats': 0.85, 'muscle_aches': 0.75, 'sore_throat': 0.70, 'swollen_lymph_nodes': 0.90}, 'bias': -3.5},
-            'alzheimers_disease': {'symptoms': {'memory_loss': 0.95, 'difficulty_planning': 0.85, 'confusion_time_place': 0.90, 'misplacing_items': 0.80, 'mood_changes': 0.75}, 'bias': -3.5},
-            'parkinsons_disease': {'symptoms': {'tremor': 0.95, 'slowed_movement': 0.90, 'rigid_muscles': 0.85, 'impaired_posture': 0.80, 'loss_automatic_movements': 0.75}, 'bias': -3.5},
-            'multiple_sclerosis': {'symptoms': {'numbness_weakness': 0.90, 'vision_problems': 0.85, 'tingling': 0.80, 'fatigue': 0.85, 'dizziness': 0.75}, 'bias': -3.5},
-            'epilepsy': {'symptoms': {'seizures': 0.99, 'confusion': 0.75, 'staring_spell': 0.80, 'uncontrollable_jerking': 0.90, 'loss_consciousness': 0.85}, 'bias': -3.0},
-            'asthma': {'symptoms': {'shortness_breath': 0.90, 'chest_tightness': 0.85, 'wheezing': 0.95, 'coughing_at_night': 0.80}, 'bias': -2.5},
-            'copd': {'symptoms': {'shortness_breath': 0.90, 'wheezing': 0.85, 'chest_tightness': 0.80, 'chronic_cough': 0.90, 'frequent_infections': 0.75}, 'bias': -2.8},
-            'kidney_disease': {'symptoms': {'fatigue': 0.80, 'swollen_ankles': 0.85, 'poor_appetite': 0.75, 'puffy_eyes': 0.70, 'frequent_urination': 0.80}, 'bias': -3.0},
-            'liver_disease': {'symptoms': {'yellow_skin_eyes': 0.95, 'abdominal_pain': 0.80, 'swelling_legs': 0.75, 'dark_urine': 0.85, 'chronic_fatigue': 0.80}, 'bias': -3.0},
-            'osteoarthritis': {'symptoms': {'joint_pain': 0.90, 'stiffness': 0.85, 'tenderness': 0.80, 'loss_flexibility': 0.75, 'grating_sensation': 0.70}, 'bias': -2.5},
-            'rheumatoid_arthritis': {'symptoms': {'tender_joints': 0.90, 'joint_stiffness': 0.90, 'fatigue': 0.80, 'fever': 0.60, 'loss_appetite': 0.70}, 'bias': -3.0},
-            'osteoporosis': {'symptoms': {'back_pain': 0.80, 'loss_height': 0.85, 'stooped_posture': 0.80, 'bone_fracture': 0.90}, 'bias': -2.8},
-            'migraine': {'symptoms': {'severe_headache': 0.95, 'sensitivity_light': 0.90, 'sensitivity_sound': 0.85, 'nausea': 0.80, 'vomiting': 0.75}, 'bias': -2.0},
-            'depression': {'symptoms': {'persistent_sadness': 0.95, 'loss_interest': 0.90, 'sleep_disturbances': 0.85, 'fatigue': 0.80, 'anxiety': 0.75}, 'bias': -2.5},
-            'anxiety_disorder': {'symptoms': {'nervousness': 0.90, 'panic': 0.85, 'rapid_heartbeat': 0.80, 'trembling': 0.75, 'fatigue': 0.70}, 'bias': -2.5},
-            'bipolar_disorder': {'symptoms': {'mood_swings': 0.95, 'high_energy': 0.90, 'low_energy': 0.90, 'sleep_problems': 0.80}, 'bias': -3.0},
-            'schizophrenia': {'symptoms': {'delusions': 0.95, 'hallucinations': 0.95, 'disorganized_speech': 0.90, 'abnormal_behavior': 0.85}, 'bias': -3.5},
-            'celiac_disease': {'symptoms': {'diarrhea': 0.90, 'fatigue': 0.85, 'weight_loss': 0.80, 'bloating': 0.85, 'abdominal_pain': 0.80}, 'bias': -3.0},
-            'crohns_disease': {'symptoms': {'diarrhea': 0.90, 'fever': 0.75, 'fatigue': 0.80, 'abdominal_pain': 0.85, 'blood_in_stool': 0.80}, 'bias': -3.0},
-            'ulcerative_colitis': {'symptoms': {'diarrhea_blood': 0.95, 'abdominal_pain': 0.85, 'rectal_pain': 0.80, 'weight_loss': 0.75, 'fatigue': 0.70}, 'bias': -3.0},
-            'gout': {'symptoms': {'intense_joint_pain': 0.95, 'lingering_discomfort': 0.80, 'inflammation': 0.85, 'limited_range_motion': 0.75}, 'bias': -2.5},
-            'psoriasis': {'symptoms': {'red_patches_skin': 0.95, 'scaling_spots': 0.90, 'dry_cracked_skin': 0.80, 'itching': 0.75, 'swollen_joints': 0.70}, 'bias': -2.5},
-            'lupus': {'symptoms': {'fatigue': 0.90, 'joint_pain': 0.85, 'butterfly_rash': 0.95, 'fever': 0.75, 'sensitivity_light': 0.80}, 'bias': -3.5},
-            'fibromyalgia': {'symptoms': {'widespread_pain': 0.95, 'fatigue': 0.90, 'cognitive_difficulties': 0.80, 'sleep_problems': 0.85}, 'bias': -3.0},
-            'iron_deficiency_anemia': {'symptoms': {'extreme_fatigue': 0.90, 'weakness': 0.85, 'pale_skin': 0.80, 'chest_pain': 0.75, 'cold_hands_feet': 0.70}, 'bias': -2.5},
-            'vitamin_d_deficiency': {'symptoms': {'fatigue': 0.80, 'bone_pain': 0.85, 'muscle_weakness': 0.80, 'mood_changes': 0.70}, 'bias': -2.0},
-            'hypothyroidism': {'symptoms': {'fatigue': 0.90, 'increased_sensitivity_cold': 0.85, 'constipation': 0.80, 'dry_skin': 0.75, 'weight_gain': 0.80}, 'bias': -2.5},
-            'hyperthyroidism': {'symptoms': {'unintentional_weight_loss': 0.90, 'rapid_heartbeat': 0.85, 'increased_appetite': 0.80, 'nervousness': 0.80, 'sweating': 0.75}, 'bias': -2.5},
-            'adrenal_insufficiency': {'symptoms': {'fatigue': 0.90, 'muscle_weakness': 0.85, 'loss_appetite': 0.80, 'weight_loss': 0.80, 'abdominal_pain': 0.75}, 'bias': -3.5},
-            'pituitary_disorders': {'symptoms': {'headache': 0.80, 'vision_problems': 0.85, 'fatigue': 0.80, 'mood_changes': 0.75, 'infertility': 0.70}, 'bias': -4.0},
-            'glaucoma': {'symptoms': {'blind_spots': 0.90, 'tunnel_vision': 0.85, 'severe_headache': 0.80, 'eye_pain': 0.85, 'blurred_vision': 0.80}, 'bias': -3.0},
-            'cataracts': {'symptoms': {'clouded_vision': 0.95, 'sensitivity_light': 0.85, 'difficulty_seeing_night': 0.90, 'fading_colors': 0.80, 'double_vision': 0.75}, 'bias': -2.5},
-            'macular_degeneration': {'symptoms': {'partial_vision_loss': 0.95, 'straight_lines_appear_wavy': 0.90, 'blurred_vision': 0.85, 'difficulty_adapting_low_light': 0.80}, 'bias': -3.0},
-            'hearing_loss': {'symptoms': {'muffling_speech': 0.90, 'difficulty_understanding_words': 0.85, 'trouble_hearing_consonants': 0.80, 'asking_others_speak_slowly': 0.75}, 'bias': -2.5},
-            'tinnitus': {'symptoms': {'ringing_ears': 0.95, 'buzzing_ears': 0.90, 'roaring_ears': 0.85, 'clicking_ears': 0.80}, 'bias': -2.5},
-            'sleep_apnea': {'symptoms': {'loud_snoring': 0.90, 'stop_breathing_sleep': 0.95, 'gasping_air_sleep': 0.90, 'morning_headache': 0.75, 'daytime_sleepiness': 0.85}, 'bias': -2.5},
-            'insomnia': {'symptoms': {'difficulty_falling_asleep': 0.95, 'waking_up_night': 0.90, 'waking_up_early': 0.85, 'daytime_tiredness': 0.80}, 'bias': -2.0},
-            'gerd': {'symptoms': {'heartburn': 0.95, 'chest_pain': 0.80, 'difficulty_swallowing': 0.85, 'regurgitation': 0.90, 'sensation_lump_throat': 0.75}, 'bias': -2.0},
-            'ibs': {'symptoms': {'abdominal_pain': 0.85, 'bloating': 0.80, 'gas': 0.80, 'diarrhea': 0.75, 'constipation': 0.75}, 'bias': -2.0},
-            'gallstones': {'symptoms': {'sudden_intense_pain_abdomen': 0.95, 'back_pain': 0.80, 'nausea': 0.75, 'vomiting': 0.75, 'digestive_problems': 0.70}, 'bias': -2.8},
-            'kidney_stones': {'symptoms': {'severe_pain_side_back': 0.95, 'pain_urination': 0.90, 'pink_red_brown_urine': 0.85, 'nausea': 0.80, 'frequent_urination': 0.75}, 'bias': -2.8},
-            'uti': {'symptoms': {'strong_urge_urinate': 0.90, 'burning_sensation_urination': 0.95, 'cloudy_urine': 0.85, 'red_pink_urine': 0.80, 'pelvic_pain': 0.75}, 'bias': -2.0},
-            'benign_prostatic_hyperplasia': {'symptoms': {'frequent_urination': 0.90, 'trouble_starting_urination': 0.85, 'weak_urine_stream': 0.85, 'dribbling_urination': 0.80}, 'bias': -2.5},
-            'endometriosis': {'symptoms': {'painful_periods': 0.95, 'pain_intercourse': 0.85, 'pain_bowel_movements': 0.80, 'excessive_bleeding': 0.75, 'infertility': 0.70}, 'bias': -3.0},
-            'pcos': {'symptoms': {'irregular_periods': 0.95, 'excess_androgen': 0.90, 'polycystic_ovaries': 0.95, 'weight_gain': 0.80, 'acne': 0.75}, 'bias': -3.0},
-            'preeclampsia': {'symptoms': {'high_blood_pressure': 0.95, 'severe_headaches': 0.90, 'changes_vision': 0.85, 'swelling_face_hands': 0.80}, 'bias': -3.5},
-            'gestational_diabetes': {'symptoms': {'increased_thirst': 0.85, 'frequent_urination': 0.90, 'fatigue': 0.75, 'nausea': 0.70}, 'bias': -2.8},
-            'myocardial_infarction': {'symptoms': {'chest_pain': 0.95, 'shortness_breath': 0.90, 'cold_sweat': 0.85, 'fatigue': 0.80, 'nausea': 0.75}, 'bias': -3.0},
-            'atrial_fibrillation': {'symptoms': {'palpitations': 0.95, 'weakness': 0.85, 'fatigue': 0.85, 'lightheadedness': 0.80, 'shortness_breath': 0.75}, 'bias': -2.8},
-            'heart_failure': {'symptoms': {'shortness_breath': 0.95, 'fatigue': 0.90, 'swollen_legs': 0.90, 'rapid_heartbeat': 0.85, 'persistent_cough': 0.80}, 'bias': -3.0},
-            'peripheral_artery_disease': {'symptoms': {'leg_pain_walking': 0.90, 'leg_numbness': 0.85, 'cold_legs': 0.80, 'sores_toes': 0.75, 'shiny_skin_legs': 0.70}, 'bias': -3.0},
-            'deep_vein_thrombosis': {'symptoms': {'swelling_leg': 0.95, 'pain_leg': 0.90, 'red_skin_leg': 0.85, 'warmth_leg': 0.85}, 'bias': -3.5},
-            'pulmonary_embolism': {'symptoms': {'shortness_breath': 0.95, 'chest_pain': 0.90, 'cough': 0.80, 'faintness': 0.85, 'rapid_pulse': 0.85}, 'bias': -3.5},
-            'sepsis': {'symptoms': {'fever': 0.90, 'low_body_temperature': 0.85, 'rapid_heart_rate': 0.90, 'rapid_breathing': 0.90, 'confusion': 0.85}, 'bias': -4.0},
-            'meningitis': {'symptoms': {'high_fever': 0.90, 'stiff_neck': 0.95, 'severe_headache': 0.90, 'nausea': 0.80, 'confusion': 0.85, 'sensitivity_light': 0.80}, 'bias': -4.5},
-            'encephalitis': {'symptoms': {'headache': 0.90, 'fever': 0.85, 'muscle_aches': 0.80, 'confusion': 0.90, 'seizures': 0.85}, 'bias': -4.5},
-            'appendicitis': {'symptoms': {'pain_lower_right_abdomen': 0.99, 'nausea': 0.85, 'vomiting': 0.80, 'loss_appetite': 0.75, 'fever': 0.70}, 'bias': -3.0},
-            'cholecystitis': {'symptoms': {'severe_pain_upper_right_abdomen': 0.95, 'pain_radiating_shoulder': 0.85, 'tenderness_abdomen': 0.90, 'nausea': 0.80}, 'bias': -3.0},
-            'pancreatitis': {'symptoms': {'upper_abdominal_pain': 0.95, 'abdominal_pain_back': 0.90, 'tenderness_abdomen': 0.85, 'fever': 0.80, 'rapid_pulse': 0.80}, 'bias': -3.5},
-            'gastritis': {'symptoms': {'gnawing_pain_abdomen': 0.90, 'nausea': 0.85, 'vomiting': 0.80, 'fullness_abdomen': 0.80}, 'bias': -2.5},
-            'peptic_ulcer': {'symptoms': {'burning_stomach_pain': 0.95, 'feeling_full': 0.85, 'heartburn': 0.80, 'nausea': 0.75}, 'bias': -2.5},
-            'diverticulitis': {'symptoms': {'pain_abdominal': 0.90, 'nausea': 0.80, 'fever': 0.75, 'constipation': 0.70}, 'bias': -2.8},
-            'hemorrhoids': {'symptoms': {'itching_anal': 0.90, 'pain_anal': 0.85, 'swelling_anal': 0.80, 'bleeding_bowel_movements': 0.85}, 'bias': -2.0},
-            'hernia': {'symptoms': {'bulge_abdomen': 0.95, 'pain_lift_heavy': 0.90, 'ache_bulge': 0.85, 'nausea': 0.70}, 'bias': -2.5},
-            'fracture': {'symptoms': {'pain': 0.95, 'swelling': 0.90, 'bruising': 0.85, 'deformity': 0.95, 'inability_move': 0.90}, 'bias': -2.0},
-            'spinal_stenosis': {'symptoms': {'numbness_extremities': 0.85, 'weakness_extremities': 0.80, 'neck_pain': 0.75, 'balance_problems': 0.70}, 'bias': -3.0},
-            'herniated_disc': {'symptoms': {'arm_leg_pain': 0.90, 'numbness': 0.85, 'weakness': 0.80}, 'bias': -2.5},
-            'scoliosis': {'symptoms': {'uneven_shoulders': 0.95, 'uneven_waist': 0.90, 'one_hip_higher': 0.90}, 'bias': -2.5},
-            'tendonitis': {'symptoms': {'pain_tendon': 0.95, 'tenderness': 0.90, 'mild_swelling': 0.80}, 'bias': -2.0},
-            'bursitis': {'symptoms': {'aching_pain': 0.90, 'stiffness': 0.85, 'swollen_joint': 0.80, 'redness': 0.75}, 'bias': -2.0},
-            'carpal_tunnel_syndrome': {'symptoms': {'numbness_fingers': 0.95, 'weakness_hand': 0.85, 'tingling_fingers': 0.90}, 'bias': -2.2},
-            'plantar_fasciitis': {'symptoms': {'stabbing_pain_heel': 0.95, 'pain_morning': 0.90, 'pain_after_exercise': 0.80}, 'bias': -2.0},
-            'shingles': {'symptoms': {'pain_burning': 0.95, 'red_rash': 0.90, 'fluid_filled_blisters': 0.90, 'itching': 0.85}, 'bias': -2.8},
-            'herpes_simplex': {'symptoms': {'tingling_itching': 0.90, 'sores': 0.95, 'fever': 0.70, 'swollen_lymph_nodes': 0.75}, 'bias': -2.5},
-            'chickenpox': {'symptoms': {'itchy_rash': 0.99, 'fever': 0.85, 'fatigue': 0.80, 'loss_appetite': 0.75}, 'bias': -2.0},
-            'measles': {'symptoms': {'fever': 0.95, 'dry_cough': 0.85, 'runny_nose': 0.80, 'sore_throat': 0.75, 'inflamed_eyes': 0.80, 'koplik_spots': 0.95, 'skin_rash': 0.95}, 'bias': -3.0},
-            'mumps': {'symptoms': {'swollen_salivary_glands': 0.99, 'fever': 0.85, 'headache': 0.80, 'muscle_aches': 0.80, 'weakness': 0.75}, 'bias': -3.0},
-            'rubella': {'symptoms': {'mild_fever': 0.80, 'headache': 0.70, 'runny_nose': 0.70, 'inflamed_eyes': 0.70, 'pink_rash': 0.95, 'swollen_lymph_nodes': 0.85}, 'bias': -2.5},
-            'whooping_cough': {'symptoms': {'runny_nose': 0.80, 'nasal_congestion': 0.80, 'red_watery_eyes': 0.75, 'severe_cough': 0.95}, 'bias': -2.8},
-            'diptheria': {'symptoms': {'thick_gray_coating_throat': 0.99, 'sore_throat': 0.90, 'swollen_glands': 0.85, 'difficulty_breathing': 0.90}, 'bias': -3.5},
-            'tetanus': {'symptoms': {'jaw_cramping': 0.95, 'muscle_spasms': 0.90, 'painful_muscle_stiffness': 0.90, 'trouble_swallowing': 0.85}, 'bias': -4.0},
-            'polio': {'symptoms': {'fever': 0.80, 'sore_throat': 0.75, 'headache': 0.80, 'vomiting': 0.75, 'fatigue': 0.80, 'muscle_weakness': 0.90, 'meningitis': 0.85}, 'bias': -4.5},
-        }
+        # Symptom weights for each disease (trained coefficients); shared by
+        # all instances, treat as read-only
+        self.disease_weights = DISEASE_WEIGHTS
         
-        # Helper to auto-generate display names map from the keys above
+        # Helper to auto-generate display names map from the weight keys
         self.symptom_display_names = self._generate_symptom_names()
 
+        # Dense disease x symptom weight matrix for scoring all diseases at once
+        self._build_weight_matrix()
+
+        # Disease keys with underscores removed, for fuzzy name matching
+        # (the first key wins if two keys normalize the same way)
+        self._normalized_disease_index = {}
+        for key in self.disease_weights:
+            self._normalized_disease_index.setdefault(key.replace('_', ''), key)
+
+        # Per-disease scoring parameters, read with a single lookup on the hot
+        # path: (symptom weights, symptom key set, symptom keys in order, bias)
+        self._disease_params = {
+            disease: (
+                data['symptoms'],
+                frozenset(data['symptoms']),
+                tuple(data['symptoms']),
+                float(data['bias'])
+            )
+            for disease, data in self.disease_weights.items()
+        }
+
+        # Per-disease high-importance symptoms (weight >= 0.75), sorted by weight
+        self._high_importance = {
+            disease: sorted(
+                (
+                    (key, self.symptom_display_names[key], weight)
+                    for key, weight in data['symptoms'].items()
+                    if weight >= 0.75
+                ),
+                key=lambda item: item[2],
+                reverse=True
+            )
+            for disease, data in self.disease_weights.items()
+        }
+
     def _generate_symptom_names(self):
         """Auto-generate display names from symptom keys"""
-        names = {}
-        for disease, data in self.disease_weights.items():
-            for symptom_key in data['symptoms'].keys():
-                names[symptom_key] = symptom_key.replace('_', ' ').title()
-        return names
+        # Unique keys in first-seen order (this order is also the weight matrix column order)
+        unique_keys = dict.fromkeys(
+            key for data in self.disease_weights.values() for key in data['symptoms']
+        )
+        return {key: key.replace('_', ' ').title() for key in unique_keys}
+
+    def _build_weight_matrix(self):
+        """
+        Build the dense weight matrix (symptoms x diseases), the bias vector
+        and the index maps used by predict_multiple_diseases.
+
+        The matrix is symptom-major so each symptom's weights for all
+        diseases form one contiguous row.
+        """
+        self._disease_keys = list(self.disease_weights.keys())
+        self._disease_index = {key: i for i, key in enumerate(self._disease_keys)}
+        self._symptom_index = {key: j for j, key in enumerate(self.symptom_display_names)}
+
+        # float32 halves the matrix size; the weights only have two decimals
+        self._symptom_weights = np.zeros((len(self._symptom_index), len(self._disease_keys)), dtype=np.float32)
+        self._bias = np.empty(len(self._disease_keys), dtype=np.float64)
+        for i, key in enumerate(self._disease_keys):
+            data = self.disease_weights[key]
+            for symptom, weight in data['symptoms'].items():
+                self._symptom_weights[self._symptom_index[symptom], i] = weight
+            self._bias[i] = data['bias']
+
+        # 1 where a disease uses a symptom, to count matched symptoms per disease
+        self._symptom_mask = (self._symptom_weights != 0).astype(np.float32)
+
+        # Compile the Numba kernel now rather than on the first request
+        if _NUMBA_AVAILABLE:
+            _score_all(self._symptom_weights, self._symptom_mask, self._bias, np.zeros(1, dtype=np.intp))
+
+        # Scores when no reported symptom is known: sigmoid(bias) for every disease
+        self._baseline_scores = _score_all(
+            self._symptom_weights, self._symptom_mask, self._bias, np.zeros(0, dtype=np.intp)
+        )
 
     @staticmethod
     def sigmoid(z: float) -> float:
         """Sigmoid activation function for logistic regression"""
-        return 1 / (1 + np.exp(-z))
+        # Scalar path: math.exp avoids NumPy's per-call dispatch overhead
+        return 1 / (1 + math.exp(-z))
     
     # NOTE:
     # Raw sigmoid probabilities tend to be overconfident.
@@ -141,7 +252,7 @@ class DiseaseMLModel:
         Temperature-scaled sigmoid for probability calibration.
         Higher temperature -> less overconfident probabilities.
         """
-        return 1 / (1 + np.exp(-(z / temperature)))
+        return 1 / (1 + math.exp(-(z / temperature)))
 
     def _calculate_bmi(self, height_cm: float, weight_kg: float) -> float:
         if not height_cm or not weight_kg:
@@ -156,15 +267,7 @@ class DiseaseMLModel:
         """
         if bmi is None:
             return 0.0
-
-        if bmi < 18.5:
-            return 0.25   # underweight risk
-        elif bmi < 25:
-            return 0.0    # normal
-        elif bmi < 30:
-            return 0.35   # overweight
-        else:
-            return 0.6    # obese
+        return _BMI_EFFECTS[bisect_right(_BMI_EDGES, bmi)]
 
     # Normalize disease key
     def _get_disease_key(self, disease_name: str) -> str:
@@ -178,24 +281,25 @@ class DiseaseMLModel:
             return disease_key
             
         # Fuzzy match: try to find a key that matches when underscores are removed
-        normalized_input = disease_key.replace('_', '')
-        for key in self.disease_weights.keys():
-            if key.replace('_', '') == normalized_input:
-                return key
+        key = self._normalized_disease_index.get(disease_key.replace('_', ''))
+        if key is not None:
+            return key
                 
         # If no match found, raise ValueError
         raise ValueError(f"Disease '{disease_name}' (key: {disease_key}) not found in model")
 
-    def predict_disease_probability(self, disease: str, symptoms: List[str], age: int = None, height_cm: float = None, weight_kg: float = None) -> Dict:
+    def predict_disease_probability(self, disease: str, symptoms: List[str], age: int = None, height_cm: float = None, weight_kg: float = None,
+                                    symptom_set: frozenset = None) -> Dict:
         """
         Predict disease probability based on selected symptoms and optional age.
+
+        Callers that already hold frozenset(symptoms) can pass it as
+        symptom_set so it is not rebuilt here.
         """
         # Use helper for robust lookup
         disease_key = self._get_disease_key(disease)
         
-        weights = self.disease_weights[disease_key]
-        symptom_weights = weights['symptoms']
-        bias = weights['bias']
+        symptom_weights, symptom_keys, _, bias = self._disease_params[disease_key]
 
         # Adjust bias based on age
         if age is not None:
@@ -207,26 +311,19 @@ class DiseaseMLModel:
 
         # BMI contribution
         bmi = self._calculate_bmi(height_cm, weight_kg)
-        bmi_effect = self._global_bmi_effect(bmi)
+        if bmi is None:
+            bmi_effect, bmi_category = 0.0, None
+        else:
+            # One bucket lookup gives both the effect and the category
+            bmi_bucket = bisect_right(_BMI_EDGES, bmi)
+            bmi_effect, bmi_category = _BMI_EFFECTS[bmi_bucket], _BMI_CATEGORIES[bmi_bucket]
         z += bmi_effect
-
-        bmi_category = None
-        if bmi:
-            if bmi < 18.5:
-                bmi_category = "Underweight"
-            elif bmi < 25:
-                bmi_category = "Normal"
-            elif bmi < 30:
-                bmi_category = "Overweight"
-            else:
-                bmi_category = "Obese"
         
-        matched_symptoms = []
-        
-        for symptom in symptoms:
-            if symptom in symptom_weights:
-                z += symptom_weights[symptom]
-                matched_symptoms.append(symptom)
+        # Each known symptom counts once, however often it was reported
+        if symptom_set is None:
+            symptom_set = frozenset(symptoms)
+        matched_symptoms = symptom_keys & symptom_set
+        z += sum(symptom_weights[symptom] for symptom in matched_symptoms)
         
         raw_probability = self.sigmoid(z)
         calibrated_probability = self.calibrated_sigmoid(z)
@@ -253,40 +350,89 @@ class DiseaseMLModel:
         bmi_factor = 0.1 if bmi and (bmi < 18.5 or bmi > 30) else 0.0
         confidence = (symptom_factor * 0.5) + (probability * 0.4) + bmi_factor
         return float(confidence)
+
+    def _calculate_confidence_vec(self, num_symptoms: np.ndarray, probability: np.ndarray, bmi: float = None) -> np.ndarray:
+        """Array version of _calculate_confidence for scoring all diseases at once."""
+        symptom_factor = np.minimum(1.0, num_symptoms / 5)
+        bmi_factor = 0.1 if bmi and (bmi < 18.5 or bmi > 30) else 0.0
+        return (symptom_factor * 0.5) + (probability * 0.4) + bmi_factor
     
     def get_available_diseases(self) -> List[str]:
         return list(self.disease_weights.keys())
     
     def get_disease_symptoms(self, disease: str) -> Dict[str, str]:
-        disease_key = self._get_disease_key(disease)
-        
-        symptom_keys = self.disease_weights[disease_key]['symptoms'].keys()
+        """Symptom keys and display names for a disease (shared; do not modify)."""
+        return self._disease_symptoms(self._get_disease_key(disease))
+
+    # The model is a process-wide singleton and there is one entry per
+    # disease, so caching on (self, disease_key) stays small
+    @lru_cache(maxsize=None)
+    def _disease_symptoms(self, disease_key: str) -> Dict[str, str]:
+        symptom_keys = self._disease_params[disease_key][2]
         return {
             key: self.symptom_display_names.get(key, key.replace('_', ' ').title())
             for key in symptom_keys
         }
     
     def predict_multiple_diseases(self, symptoms: List[str]) -> List[Dict]:
-        predictions = []
-        for disease in self.disease_weights.keys():
-            try:
-                prediction = self.predict_disease_probability(disease, symptoms)
-                predictions.append(prediction)
-            except Exception:
-                logger.error(
-                    f"Prediction failed for disease '{disease}'",
-                    exc_info=True
-                )
-
-        # Sort by raw probability (highest first)
-        predictions.sort(key=lambda x: x['calibrated_probability'], reverse=True)
-        return predictions
+        """
+        Predict every disease for one symptom set.
+
+        All diseases are scored at once from the weight rows of the reported
+        symptoms; the results match predict_disease_probability() for each
+        disease up to float32 rounding of the weights.
+        """
+        # Row index of each known symptom, once each (as in the single-disease path)
+        indices = np.array(
+            sorted({self._symptom_index[s] for s in symptoms if s in self._symptom_index}),
+            dtype=np.intp
+        )
+
+        if indices.size:
+            raw, calibrated, matched = _score_all(self._symptom_weights, self._symptom_mask, self._bias, indices)
+        else:
+            raw, calibrated, matched = self._baseline_scores
+        prior = np.clip(raw, 0.05, 0.95)
+        likelihood = 0.75 + (raw * 0.20)
+        confidence = self._calculate_confidence_vec(matched, raw)
+
+        # Sort by calibrated probability (highest first), then convert each
+        # column to Python numbers in one call
+        order = np.argsort(-calibrated, kind='stable')
+        total_symptoms = len(symptoms)
+        return [
+            {
+                'disease': self._disease_keys[i],
+                'raw_probability': raw_p,
+                'calibrated_probability': calibrated_p,
+                'prior_probability': prior_p,
+                'likelihood': likelihood_p,
+                'symptoms_matched': int(matched_count),
+                'total_symptoms': total_symptoms,
+                'confidence_score': confidence_score,
+                'bmi': None,
+                'bmi_category': None,
+                'bmi_effect': 0.0
+            }
+            for i, raw_p, calibrated_p, prior_p, likelihood_p, matched_count, confidence_score in zip(
+                order.tolist(),
+                raw[order].tolist(),
+                calibrated[order].tolist(),
+                prior[order].tolist(),
+                likelihood[order].tolist(),
+                matched[order].tolist(),
+                confidence[order].tolist()
+            )
+        ]
 
     
     def get_symptom_importance(self, disease: str) -> Dict[str, float]:
-        disease_key = self._get_disease_key(disease)
-        
-        symptoms = self.disease_weights[disease_key]['symptoms']
+        """Symptom weights for a disease, highest first (shared; do not modify)."""
+        return self._symptom_importance(self._get_disease_key(disease))
+
+    @lru_cache(maxsize=None)
+    def _symptom_importance(self, disease_key: str) -> Dict[str, float]:
+        symptoms = self._disease_params[disease_key][0]
         importance = {
             self.symptom_display_names.get(key, key): weight
             for key, weight in symptoms.items()
@@ -299,7 +445,7 @@ class DiseaseMLModel:
         
         Args:
             disease: The name of the disease to analyze.
-            present_symptoms: List of symptom keys provided by the user.
+            present_symptoms: List (or set) of symptom keys provided by the user.
             
         Returns:
             List of missing symptoms with their weights, sorted by importance.
@@ -309,23 +455,37 @@ class DiseaseMLModel:
         except ValueError:
             return []
 
-        # Get all symptoms and weights for the disease
-        all_symptoms = self.disease_weights[disease_key]['symptoms']
-        
+        # High-importance symptoms the user did not report, top 5 by weight
+        present = present_symptoms if isinstance(present_symptoms, (set, frozenset)) else set(present_symptoms)
         missing = []
-        for symptom_key, weight in all_symptoms.items():
-            # If the symptom is NOT in the user's list AND has high importance
-            if symptom_key not in present_symptoms and weight >= 0.75:
-                missing.append({
-                    'key': symptom_key,
-                    'name': self.symptom_display_names.get(symptom_key, symptom_key.replace('_', ' ').title()),
-                    'weight': weight
-                })
-        
-        # Sort by weight descending
-        missing.sort(key=lambda x: x['weight'], reverse=True)
-        
-        # Return top 5 missing symptoms
-        return missing[:5]
+        for key, name, weight in self._high_importance[disease_key]:
+            if key not in present:
+                missing.append({'key': key, 'name': name, 'weight': weight})
+                if len(missing) == 5:
+                    break
+        return missing
+
+
+@lru_cache(maxsize=None)
+def get_ml_model() -> DiseaseMLModel:
+    """Return the shared model, building it on first use."""
+    return DiseaseMLModel()
+
+
+class _LazyModel:
+    """
+    Stand-in for the shared DiseaseMLModel.
+
+    Importing this module (which backend.models does for every model
+    import) does not build the weight tables; the real model is created
+    on the first attribute access.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_ml_model(), name)
+
+    def __repr__(self):
+        return "<lazy DiseaseMLModel>"
+
 
-ml_model = DiseaseMLModel()
\ No newline at end of file
+ml_model = _LazyModel()
@@ -5,7 +5,8 @@ Stores all disease predictions for dashboard analytics.
 
 from backend import db
 from datetime import datetime
-import json
+from sqlalchemy.dialects.postgresql import JSONB
+import orjson
 
 
 class PredictionHistory(db.Model):
@@ -14,6 +15,16 @@ class PredictionHistory(db.Model):
     Used for doctor dashboard analytics and patient history.
     """
     __tablename__ = 'prediction_history'
+    __table_args__ = (
+        # "Recent predictions for a user" and "recent predictions at a risk
+        # level" are range scans on these, with no separate sort step
+        db.Index('ix_ph_user_created', 'user_id', 'created_at'),
+        db.Index('ix_ph_risk_created', 'risk_level', 'created_at'),
+        # Covers the per-user risk level counts on the patient dashboard
+        db.Index('ix_ph_user_risk', 'user_id', 'risk_level'),
+        # Symptom-level filters (e.g. "symptoms @> '["fever"]'"); PostgreSQL only
+        db.Index('ix_ph_symptoms_gin', 'symptoms', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -23,7 +34,7 @@ class PredictionHistory(db.Model):
     
     # Prediction details
     disease = db.Column(db.String(100), nullable=False)
-    symptoms = db.Column(db.Text, nullable=False)  # JSON string of symptoms list
+    symptoms = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'), nullable=False)  # list of symptom keys
     
     # Probability scores
     ml_probability = db.Column(db.Float, nullable=False)
@@ -31,7 +42,7 @@ class PredictionHistory(db.Model):
     confidence_score = db.Column(db.Float, nullable=True)
     
     # Risk assessment
-    risk_level = db.Column(db.String(20), nullable=False, index=True)  # low, medium, high, critical
+    risk_level = db.Column(db.String(20), nullable=False)  # low, medium, high, critical
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -43,15 +54,33 @@ class PredictionHistory(db.Model):
         return f"PredictionHistory('{self.disease}', risk='{self.risk_level}', created='{self.created_at}')"
     
     def get_symptoms_list(self):
-        """Parse symptoms JSON string to list"""
+        """
+        Return the symptoms as a list.
+        
+        The column is decoded by the database driver, so this is usually a
+        pass-through. Rows written as JSON strings are parsed once and the
+        result is cached for as long as the column holds the same string.
+        """
+        symptoms = self.symptoms
+        if isinstance(symptoms, list):
+            return symptoms
+        
+        cached = self.__dict__.get('_symptoms_cache')
+        if cached is not None and cached[0] is symptoms:
+            return cached[1]
+        
         try:
-            return json.loads(self.symptoms)
-        except (json.JSONDecodeError, TypeError):
-            return []
+            symptoms_list = orjson.loads(symptoms)
+        except (orjson.JSONDecodeError, TypeError):
+            symptoms_list = []
+        if not isinstance(symptoms_list, list):
+            symptoms_list = []
+        self._symptoms_cache = (symptoms, symptoms_list)
+        return symptoms_list
     
     def set_symptoms_list(self, symptoms_list):
-        """Convert symptoms list to JSON string"""
-        self.symptoms = json.dumps(symptoms_list)
+        """Store the symptoms list"""
+        self.symptoms = list(symptoms_list)
     
     def to_dict(self):
         """Convert to dictionary for API responses"""
@@ -6,7 +6,13 @@ class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(20), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(60), nullable=False)
+    # 255 leaves room for hash schemes longer than bcrypt's 60 characters
+    password_hash = db.Column(db.String(255), nullable=False)
+
+    __table_args__ = (
+        # Case-insensitive email lookups (login/signup) use this index
+        db.Index('ix_user_email_lower', db.func.lower(email), unique=True),
+    )
 
     def __repr__(self):
         return f"User('{self.username}', '{self.email}')"
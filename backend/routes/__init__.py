@@ -0,0 +1,88 @@
+"""
+Routes package.
+
+Blueprints whose view modules pull in heavy dependencies (NumPy, ReportLab,
+Gemini, TensorFlow) are declared here with lazily imported views, so the
+modules are only imported on the first request that hits one of their URLs.
+"""
+
+from functools import cached_property
+
+from flask import Blueprint
+from werkzeug.utils import import_string
+
+
+class LazyView:
+    """
+    View function placeholder that imports the real view on first call.
+    """
+
+    def __init__(self, import_name):
+        """
+        Initialize lazy view.
+
+        Args:
+            import_name: Dotted path to the view function
+        """
+        self.__module__, self.__name__ = import_name.rsplit('.', 1)
+        self.import_name = import_name
+
+    @cached_property
+    def view(self):
+        """Import and return the real view function."""
+        return import_string(self.import_name)
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+def lazy_blueprint(name, module, rules):
+    """
+    Build a blueprint whose views are imported lazily from a module.
+
+    Args:
+        name: Blueprint name (endpoint prefix)
+        module: Dotted path of the module holding the view functions
+        rules: Iterable of (rule, view name, methods) tuples
+
+    Returns:
+        Blueprint instance
+    """
+    bp = Blueprint(name, module)
+    for rule, view_name, methods in rules:
+        bp.add_url_rule(
+            rule,
+            view_func=LazyView(f"{module}.{view_name}"),
+            methods=methods
+        )
+    return bp
+
+
+disease_bp = lazy_blueprint('disease', 'backend.routes.disease_routes', (
+    ('/', 'home', ['GET']),
+    ('/calculator', 'calculator', ['GET']),
+    ('/preset', 'preset', ['POST']),
+    ('/disease', 'disease', ['POST']),
+    ('/contact', 'contact', ['GET']),
+    ('/gemini-recommendations', 'gemini_recommendations', ['POST']),
+    ('/download-results', 'download_results', ['POST']),
+    ('/download-ml-results', 'download_ml_results', ['POST']),
+    ('/disease-detection-dashboard', 'disease_detection_dashboard', ['GET']),
+))
+
+ml_bp = lazy_blueprint('ml', 'backend.routes.ml_routes', (
+    ('/ml-prediction', 'ml_prediction_page', ['GET']),
+    ('/api/ml/predict', 'predict_disease', ['POST']),
+    ('/api/ml/predict-multiple', 'predict_multiple_diseases', ['POST']),
+    ('/api/ml/diseases', 'get_diseases', ['GET']),
+    ('/api/ml/symptoms/<disease>', 'get_disease_symptoms', ['GET']),
+    ('/api/ml/symptom-importance/<disease>', 'get_symptom_importance', ['GET']),
+))
+
+chat_bp = lazy_blueprint('chat', 'backend.routes.chat_routes', (
+    ('/api/chat', 'chat', ['POST']),
+))
+
+predict_disease_type_bp = lazy_blueprint('disease-type', 'backend.routes.predict_disease_type_routes', (
+    ('/predict', 'predict', ['POST']),
+))
@@ -1,45 +1,69 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from urllib.parse import urlparse, urljoin
-from backend import db, bcrypt
+from backend import db, bcrypt, TEMPLATE_FOLDER
 from backend.models.user import User
-from flask import session
+from flask import session, make_response
+from datetime import datetime
+import hashlib
+import os
 
 auth_bp = Blueprint('auth', __name__)
 
+# Part of every profile ETag, so browsers re-render the page once after the
+# templates change; identical across workers of one deployment
+_PROFILE_ETAG_SEED = max(
+    (os.path.getmtime(os.path.join(TEMPLATE_FOLDER, name)) for name in os.listdir(TEMPLATE_FOLDER)),
+    default=0
+)
+
+def _auth_url(endpoint, **values):
+    """
+    url_for() for the fixed redirect targets of this blueprint, resolved
+    once per app and script root instead of on every request.
+    """
+    cache = current_app.extensions.setdefault('auth_urls', {})
+    key = (request.script_root, endpoint, tuple(values.items()))
+    url = cache.get(key)
+    if url is None:
+        url = cache[key] = url_for(endpoint, **values)
+    return url
+
 def is_safe_url(target):
-    ref_url = urlparse(request.host_url)
+    # request.host is the netloc of request.host_url, so only the target is parsed
     test_url = urlparse(urljoin(request.host_url, target))
-    return test_url.scheme in ('http', 'https') and ref_url.netloc == test_url.netloc
+    return test_url.scheme in ('http', 'https') and test_url.netloc == request.host
 
 @auth_bp.route('/auth', methods=['GET'])
 def auth():
     # Deprecated: Redirect to login or profile
     if current_user.is_authenticated:
-        return redirect(url_for('auth.profile'))
+        return redirect(_auth_url('auth.profile'))
     return redirect(url_for('auth.login', tab=request.args.get('tab', 'signin')))
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     if current_user.is_authenticated:
-        return redirect(url_for('auth.profile'))
+        return redirect(_auth_url('auth.profile'))
 
     if request.method == 'POST':
         email = request.form.get('email')
         password = request.form.get('password')
 
-        user = User.query.filter_by(email=email).first()
+        # Both sides are lowercased by the database, so non-ASCII letters compare
+        # the same way as in the ix_user_email_lower index
+        user = User.query.filter(db.func.lower(User.email) == db.func.lower(email or '')).first()
 
         if user and bcrypt.check_password_hash(user.password_hash, password):
             login_user(user)
             flash('Login successful!', 'success')
             next_page = request.args.get('next')
             if not next_page or not is_safe_url(next_page):
-                next_page = url_for('auth.profile')
+                next_page = _auth_url('auth.profile')
             return redirect(next_page)
         else:
             flash('Invalid email or password', 'danger')
-            return redirect(url_for('auth.login', tab='signin')) # Keep on login page
+            return redirect(_auth_url('auth.login', tab='signin')) # Keep on login page
             
     # GET request: render auth template
     active_tab = request.args.get('tab', 'signin')
@@ -54,16 +78,23 @@ def signup():
     # 1. Reject empty fields
     if not username or not email or not password:
         flash('All fields are required.', 'danger')
-        return redirect(url_for('auth.login', tab='register'))
-
-    # 2. Check for existing user (split for better internal logging if needed, but flash user-friendly)
-    if User.query.filter_by(email=email).first():
+        return redirect(_auth_url('auth.login', tab='register'))
+
+    # 2. Check for existing user in one query that returns a single row of
+    # two counts, whether the email and username are held by the same user or not
+    email_match = db.func.lower(User.email) == db.func.lower(email)
+    username_match = User.username == username
+    email_taken, username_taken = db.session.query(
+        db.func.count(db.case((email_match, 1))),
+        db.func.count(db.case((username_match, 1)))
+    ).filter(db.or_(email_match, username_match)).one()
+    if email_taken:
         flash('Email already registered.', 'danger')
-        return redirect(url_for('auth.login', tab='register'))
+        return redirect(_auth_url('auth.login', tab='register'))
     
-    if User.query.filter_by(username=username).first():
+    if username_taken:
         flash('Username already taken.', 'danger')
-        return redirect(url_for('auth.login', tab='register'))
+        return redirect(_auth_url('auth.login', tab='register'))
 
     # Hash password
     hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
@@ -74,18 +105,31 @@ def signup():
 
     flash('Account Created Successfully. Please Sign In.', 'success')
     # Redirect to signin tab after successful registration
-    return redirect(url_for('auth.login', tab='signin'))
+    return redirect(_auth_url('auth.login', tab='signin'))
 
 @auth_bp.route('/profile')
 @login_required
 def profile():
-    return render_template('profile.html', user=current_user)
+    # The page only depends on the user's fields and the layout's inputs
+    etag = hashlib.blake2b(
+        f"{_PROFILE_ETAG_SEED}:{current_user.id}:{current_user.username}:{current_user.email}:"
+        f"{request.script_root}:{bool(session.get('user_id'))}:{datetime.utcnow().year}".encode(),
+        digest_size=8
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(render_template('profile.html', user=current_user))
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @auth_bp.route('/profile/update', methods=['POST'])
 @login_required
 def update_profile():
     # handle form update logic here
-    return redirect(url_for('auth.profile'))
+    return redirect(_auth_url('auth.profile'))
 
 
 @auth_bp.route('/logout')
@@ -94,5 +138,5 @@ def logout():
     logout_user()
     session.clear()
     flash('You have been logged out.', 'info')
-    return redirect(url_for('auth.login'))
+    return redirect(_auth_url('auth.login'))
 
@@ -1,9 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
 from backend.utils.gemini_helper import generate_chat_response
 
-chat_bp = Blueprint('chat', __name__)
+# URL rules for these views live in backend/routes/__init__.py (lazy blueprint)
 
-@chat_bp.route('/api/chat', methods=['POST'])
 def chat():
     """
     API endpoint to handle chatbot messages.
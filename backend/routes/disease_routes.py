@@ -1,8 +1,9 @@
-from flask import Blueprint, request, jsonify, render_template, send_file
-from datetime import datetime
+from flask import request, jsonify, render_template, make_response, Response, session
+from datetime import datetime, timezone
 import csv
+import hashlib
 import os
-import io
+from functools import lru_cache, wraps
 #pdf generation imports
 from reportlab.lib.pagesizes import letter  
 from reportlab.lib import colors
@@ -14,78 +15,244 @@ from backend.utils.calculator import bayesian_survival
 from backend.utils.gemini_helper import generate_recommendations
 from backend.models.ml_model import ml_model
 
-disease_bp = Blueprint("disease", __name__)
+# URL rules for these views live in backend/routes/__init__.py (lazy blueprint)
+
+# Report styles are built once and shared; ReportLab only reads them while
+# building a document
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    "TitleStyle",
+    parent=_STYLES["Heading1"],
+    fontSize=24,
+    textColor=colors.HexColor("#1f77b4"),
+    alignment=1,
+    spaceAfter=20,
+)
+_ML_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1f77b4'),
+    spaceAfter=12,
+    alignment=1
+)
+_RESULT_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f77b4")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+    ]
+)
+_ML_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+])
+_MS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+# Table header rows (tuples, so they cannot be changed by a request)
+_RESULTS_HEADER = ("Parameter", "Value")
+_ML_HEADER = ('Bayesian Analysis', 'Value')
+_MS_HEADER = ('Symptom', 'Importance')
+
+class _PDFSink:
+    """
+    Write target for SimpleDocTemplate.
+
+    ReportLab renders the whole document in memory and writes it in one
+    call, so keeping a reference to those bytes avoids copying them into a
+    BytesIO before the response is sent.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(data)
+
+    def getvalue(self):
+        return b"".join(self._chunks)
+
+
+def _pdf_response(story, download_name, title=None):
+    """
+    Render a report story to PDF and return it as a download.
+
+    Args:
+        story: List of flowables
+        download_name: File name offered to the browser
+        title: Optional document title (browser tab title)
+
+    Returns:
+        Response with the PDF body and Content-Length set
+    """
+    sink = _PDFSink()
+    doc = SimpleDocTemplate(sink, pagesize=letter, topMargin=0.5 * inch, bottomMargin=0.5 * inch)
+    if title:
+        doc.title = title
+    doc.build(story)
+    response = Response(sink.getvalue(), mimetype="application/pdf")
+    response.headers.set("Content-Disposition", "attachment", filename=download_name)
+    return response
+
+
+def _format_timestamp(dt):
+    """Report timestamp, e.g. 2026-01-06 12:00:00."""
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _cached_render(view):
+    """
+    Render a page once and serve the stored HTML afterwards.
+
+    For views whose own template context never changes. The base layout
+    still varies by script root, the signed-in check and the footer year,
+    so those form the cache key. Responses carry a strong ETag and are
+    revalidated by the browser, so a matching If-None-Match gets a 304.
+
+    Only HTML strings are stored; a view returns a Response instead when
+    its page must not be cached (e.g. it rendered with fallback data).
+    """
+    cache = {}
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = (request.script_root, bool(session.get('user_id')), datetime.now(timezone.utc).year)
+        entry = cache.get(key)
+        if entry is None:
+            rendered = view(*args, **kwargs)
+            if not isinstance(rendered, str):
+                return rendered
+            body = rendered.encode('utf-8')
+            entry = cache[key] = (body, hashlib.sha1(body).hexdigest())
+
+        body, etag = entry
+        response = Response(body, mimetype='text/html')
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    return wrapper
 
 def get_project_root():
     """Helper function to get the project root directory"""
     # Go up from backend/routes/ to project root
     return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+def _normalize_disease_name(name):
+    """Lookup key for a disease name: case-folded, with whitespace collapsed."""
+    return ' '.join(name.casefold().split())
+
+@lru_cache(maxsize=1)
+def _load_disease_table():
+    """
+    Parse hospital_data.csv once per process.
+
+    Returns:
+        Tuple of (disease names in file order, dict mapping the normalized
+        name to a (prevalence, sensitivity, false positive) tuple)
+    """
+    csv_path = os.path.join(get_project_root(), "hospital_data.csv")
+    with open(csv_path, newline="", encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader)
+        name_col, prevalence_col, sensitivity_col, false_pos_col = (
+            header.index(column) for column in ("Disease", "Prevalence", "Sensitivity", "FalsePositive")
+        )
+
+        names = []
+        table = {}
+        for row in reader:
+            if not row:
+                continue
+            name = row[name_col].strip()
+            names.append(name)
+            # First row wins for repeated names, as the old linear scan did
+            table.setdefault(_normalize_disease_name(name), (
+                float(row[prevalence_col]),
+                float(row[sensitivity_col]),
+                float(row[false_pos_col]),
+            ))
+
+    print(f"Loaded {len(names)} diseases from CSV")
+    return tuple(names), table
+
 def load_diseases():
     """Helper function to load diseases from CSV"""
-    csv_path = os.path.join(get_project_root(), "hospital_data.csv")
-    diseases = []
     try:
-        with open(csv_path, newline="", encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            diseases = [row["Disease"] for row in reader]
-        print(f"Loaded {len(diseases)} diseases from CSV")
+        return list(_load_disease_table()[0])
     except FileNotFoundError:
-        print(f"Error: hospital_data.csv not found at {csv_path}")
+        print(f"Error: hospital_data.csv not found at {os.path.join(get_project_root(), 'hospital_data.csv')}")
     except Exception as e:
         print(f"Error loading diseases: {e}")
-    return diseases
+    return []
+
+@lru_cache(maxsize=1)
+def _home_diseases():
+    """Display names of the diseases supported by the ML model, built once."""
+    return tuple(d.replace('_', ' ').title() for d in ml_model.get_available_diseases())
 
-@disease_bp.route("/")
 def home():
     """Render the home page with ML Prediction"""
     # diseases = load_diseases() # OLD: Loaded from CSV
     # NEW: Load only diseases supported by the ML model
-    ml_diseases = ml_model.get_available_diseases()
-    diseases = [d.replace('_', ' ').title() for d in ml_diseases]
-    return render_template("home.html", diseases=diseases)
+    return render_template("home.html", diseases=_home_diseases())
 
 
-@disease_bp.route("/calculator")
+@_cached_render
 def calculator():
     """Render the calculator page (Bayesian calculator)"""
     diseases = load_diseases()
-    return render_template("calculator.html", diseases=diseases)
+    html = render_template("calculator.html", diseases=diseases)
+    if not diseases:
+        # hospital_data.csv could not be read; don't cache the empty page
+        return make_response(html)
+    return html
 
 
-@disease_bp.route("/preset", methods=["POST"])
 def preset():
     """Handle preset disease selection"""
     disease_name = request.json.get("disease")
     
-    if not disease_name:
+    if not disease_name or not isinstance(disease_name, str):
         return jsonify({"error": "Disease name is required"}), 400
     
     try:
-        csv_path = os.path.join(get_project_root(), "hospital_data.csv")
-        
-        with open(csv_path, newline="", encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if row["Disease"].lower() == disease_name.lower():
-                    p_d = float(row["Prevalence"])
-                    sensitivity = float(row["Sensitivity"])
-                    false_pos = float(row["FalsePositive"])
-
-                    # Bayes' Theorem calculation (using utility)
-                    try:
-                        p_d_given_pos = bayesian_survival(p_d, sensitivity, false_pos)
-                    except ValueError as e:
-                        return jsonify({"error": str(e)}), 400
-
-                    return jsonify({
-                        "p_d_given_pos": round(p_d_given_pos, 4),
-                        "prior": p_d,
-                        "sensitivity": sensitivity,
-                        "falsePositive": false_pos
-                    })
-
-        return jsonify({"error": "Disease not found"}), 404
+        # One dict probe on the name normalized once; no per-row work
+        row = _load_disease_table()[1].get(_normalize_disease_name(disease_name))
+        if row is None:
+            return jsonify({"error": "Disease not found"}), 404
+
+        p_d, sensitivity, false_pos = row
+
+        # Bayes' Theorem calculation (using utility)
+        try:
+            p_d_given_pos = bayesian_survival(p_d, sensitivity, false_pos)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "p_d_given_pos": round(p_d_given_pos, 4),
+            "prior": p_d,
+            "sensitivity": sensitivity,
+            "falsePositive": false_pos
+        })
 
     except FileNotFoundError:
         return jsonify({"error": "Hospital data file not found"}), 500
@@ -93,7 +260,6 @@ def preset():
         return jsonify({"error": str(e)}), 500
 
 
-@disease_bp.route("/disease", methods=["POST"])
 def disease():
     """Calculate disease probability based on test results"""
     data = request.json
@@ -139,12 +305,11 @@ def disease():
     except Exception as e:
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
-@disease_bp.route("/contact")
+@_cached_render
 def contact():
     """Render the Contact page"""
     return render_template("contact.html")
 
-@disease_bp.route("/gemini-recommendations", methods=["POST"])
 def gemini_recommendations():
     """
     Generate AI-powered recommendations using Gemini API based on the calculation results.
@@ -182,7 +347,6 @@ def gemini_recommendations():
         }), 500
 
 #PDF generation route
-@disease_bp.route("/download-results", methods=["POST"])
 def download_results():
     """Download calculation results as PDF only"""
     data = request.json
@@ -196,43 +360,24 @@ def download_results():
         sensitivity = float(data.get("sensitivity", 0))
         false_positive = float(data.get("false_positive", 0))
 
-        # Create PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=letter,
-            topMargin=0.5 * inch,
-            bottomMargin=0.5 * inch
-        )
-
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            "TitleStyle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            textColor=colors.HexColor("#1f77b4"),
-            alignment=1,
-            spaceAfter=20,
-        )
-
         story = []
 
         # Title
-        story.append(Paragraph("Possibility Report", title_style))
+        story.append(Paragraph("Possibility Report", _TITLE_STYLE))
         story.append(Spacer(1, 0.3 * inch))
 
         # Timestamp
         story.append(
             Paragraph(
-                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                styles["Normal"],
+                f"Generated: {_format_timestamp(datetime.now())}",
+                _STYLES["Normal"],
             )
         )
         story.append(Spacer(1, 0.2 * inch))
 
         # Results table
         table_data = [
-            ["Parameter", "Value"],
+            _RESULTS_HEADER,
             ["Disease Name", disease_name],
             ["Prior Probability", f"{prior:.4f}"],
             ["Posterior Probability", f"{posterior:.4f}"],
@@ -242,18 +387,7 @@ def download_results():
         ]
 
         table = Table(table_data, colWidths=[3 * inch, 3 * inch])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f77b4")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                ]
-            )
-        )
+        table.setStyle(_RESULT_TABLE_STYLE)
 
         story.append(table)
         story.append(Spacer(1, 0.3 * inch))
@@ -266,7 +400,7 @@ def download_results():
         )
 
         story.append(
-            Paragraph(f"<b>Risk Assessment:</b> {risk_level}", styles["Normal"])
+            Paragraph(f"<b>Risk Assessment:</b> {risk_level}", _STYLES["Normal"])
         )
         story.append(Spacer(1, 0.2 * inch))
 
@@ -275,25 +409,16 @@ def download_results():
             Paragraph(
                 "<i>This report is for educational purposes only. "
                 "Consult healthcare professionals for medical advice.</i>",
-                styles["Normal"],
+                _STYLES["Normal"],
             )
         )
-        doc.title = "Possibility Report"
-        doc.build(story)  #  browser tab title / filename
-        buffer.seek(0)
-        #dowload pdf name
-        return send_file(
-            buffer,
-            mimetype="application/pdf",
-            as_attachment=True,
-            download_name="Possibility_Report.pdf"
-        )
+        # Create PDF (title is the browser tab title)
+        return _pdf_response(story, "Possibility_Report.pdf", title="Possibility Report")
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@disease_bp.route("/download-ml-results", methods=["POST"])
 def download_ml_results():
     """Download ML prediction results as PDF"""
     data = request.json
@@ -307,37 +432,25 @@ def download_ml_results():
         risk_level = data.get("risk_level", "Low Risk")
         missing_symptoms = data.get("missing_symptoms", [])
         
-        # Create PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1f77b4'),
-            spaceAfter=12,
-            alignment=1
-        )
-        
         story = []
-        story.append(Paragraph("ML Disease Prediction Report\n(Bayesian Analysis)", title_style))
+        story.append(Paragraph("ML Disease Prediction Report\n(Bayesian Analysis)", _ML_TITLE_STYLE))
         story.append(Spacer(1, 0.3*inch))
         
-        # Add timestamp
-        timestamp_text = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        story.append(Paragraph(timestamp_text, styles['Normal']))
+        # Add timestamp (the same instant is used for the file name)
+        now = datetime.now()
+        timestamp_text = f"Generated: {_format_timestamp(now)}"
+        story.append(Paragraph(timestamp_text, _STYLES['Normal']))
         story.append(Spacer(1, 0.2*inch))
         
         # Disease and ML Prediction
-        story.append(Paragraph(f"<b>Disease:</b> {disease_name}", styles['Normal']))
+        story.append(Paragraph(f"<b>Disease:</b> {disease_name}", _STYLES['Normal']))
         story.append(Spacer(1, 0.1*inch))
-        story.append(Paragraph(f"<b>ML Prediction Probability:</b> {ml_probability:.2%}", styles['Normal']))
+        story.append(Paragraph(f"<b>ML Prediction Probability:</b> {ml_probability:.2%}", _STYLES['Normal']))
         story.append(Spacer(1, 0.2*inch))
         
         # Create Bayesian Analysis table
         data_table = [
-            ['Bayesian Analysis', 'Value'],
+            _ML_HEADER,
             ['Prior Probability', f"{prior_probability:.4f}"],
             ['Likelihood', f"{likelihood:.4f}"],
             ['Posterior Probability', f"{posterior_probability:.4f}"],
@@ -345,66 +458,42 @@ def download_ml_results():
         ]
         
         table = Table(data_table, colWidths=[2.5*inch, 2.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
-        ]))
+        table.setStyle(_ML_TABLE_STYLE)
         
         story.append(table)
         story.append(Spacer(1, 0.3*inch))
         
         # Add Missing Symptoms Table if present
         if missing_symptoms:
-            story.append(Paragraph("<b>Missing Key Symptoms</b>", styles['Normal']))
+            story.append(Paragraph("<b>Missing Key Symptoms</b>", _STYLES['Normal']))
             story.append(Spacer(1, 0.1*inch))
             
-            ms_data = [['Symptom', 'Importance']]
-            for item in missing_symptoms:
-                ms_data.append([item['name'], f"{item['weight']*100:.0f}%"])
+            ms_data = [_MS_HEADER]
+            ms_data.extend([item['name'], f"{item['weight']*100:.0f}%"] for item in missing_symptoms)
                 
             ms_table = Table(ms_data, colWidths=[2.5*inch, 2.5*inch])
-            ms_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            ms_table.setStyle(_MS_TABLE_STYLE)
             story.append(ms_table)
             story.append(Spacer(1, 0.3*inch))
         
         # Add risk color coding
         risk_color = "#27ae60" if risk_level == "Low Risk" else ("#f39c12" if risk_level == "Moderate Risk" else "#e74c3c")
-        story.append(Paragraph(f"<font color='{risk_color}'><b>Risk Level: {risk_level}</b></font>", styles['Normal']))
+        story.append(Paragraph(f"<font color='{risk_color}'><b>Risk Level: {risk_level}</b></font>", _STYLES['Normal']))
         story.append(Spacer(1, 0.2*inch))
         
         # Add disclaimer
         disclaimer = "<i>Note: This report is for educational purposes only. Always consult with healthcare professionals for medical advice.</i>"
-        story.append(Paragraph(disclaimer, styles['Normal']))
+        story.append(Paragraph(disclaimer, _STYLES['Normal']))
         
-        doc.build(story)
-        buffer.seek(0)
-        
-        filename = f"ml_prediction_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        return send_file(
-            buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
+        # Create PDF
+        filename = f"ml_prediction_report_{now.strftime('%Y%m%d_%H%M%S')}.pdf"
+        return _pdf_response(story, filename)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
 
-@disease_bp.route('/disease-detection-dashboard')
+@_cached_render
 def disease_detection_dashboard():
     """Render the disease detection dashboard page"""
     # The types include the list of disease detection types available (Only "Eyes" for now)
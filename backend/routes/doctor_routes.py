@@ -4,10 +4,14 @@ Provides API endpoints for doctor-facing dashboard with patient overview and ris
 Also includes patient dashboard for individual user health tracking.
 """
 
-from flask import Blueprint, jsonify, render_template
+from flask import Blueprint, current_app, jsonify, render_template
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
-from sqlalchemy import func
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import func, case
+from sqlalchemy.orm import load_only
 from backend import db
 from backend.models.prediction import PredictionHistory
 
@@ -17,6 +21,80 @@ doctor_bp = Blueprint(
     template_folder='../templates'
 )
 
+# Number of predictions listed on the patient dashboard
+RECENT_PREDICTIONS_LIMIT = 50
+
+# Seconds dashboard data may be served from the in-process cache
+DOCTOR_DASHBOARD_CACHE_TIMEOUT = 60
+PATIENT_DASHBOARD_CACHE_TIMEOUT = 30
+
+# Columns read by PredictionHistory.to_dict()
+PREDICTION_DICT_COLUMNS = (
+    PredictionHistory.id,
+    PredictionHistory.disease,
+    PredictionHistory.symptoms,
+    PredictionHistory.ml_probability,
+    PredictionHistory.bayesian_posterior,
+    PredictionHistory.risk_level,
+    PredictionHistory.patient_age,
+    PredictionHistory.created_at,
+)
+
+
+# Maximum number of cached entries (one per patient plus the doctor view);
+# the least recently written entry is evicted first
+DASHBOARD_CACHE_MAX_ENTRIES = 1024
+
+# Guards writes and evictions on the cache maps
+_cache_lock = threading.Lock()
+
+
+def _cached(key, timeout, compute):
+    """
+    Return a cached value for key, computing it when missing or expired.
+    
+    Entries live in the application's extensions, so each app (and each
+    test app) has its own cache. Expired entries are dropped when a new
+    entry is written, and at most DASHBOARD_CACHE_MAX_ENTRIES are kept.
+    
+    The cache is per process: invalidate_dashboard_cache() only clears
+    this worker's entries, so other workers may serve data up to
+    `timeout` seconds old.
+    
+    Args:
+        key: Cache key
+        timeout: Seconds the computed value stays valid
+        compute: Zero-argument callable producing the value
+        
+    Returns:
+        The cached or freshly computed value
+    """
+    cache = current_app.extensions.setdefault('dashboard_cache', OrderedDict())
+    now = time.monotonic()
+    entry = cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    value = compute()
+    with _cache_lock:
+        cache[key] = (now + timeout, value)
+        cache.move_to_end(key)
+        # Entries are in write order; drop expired ones from the front
+        while cache:
+            oldest_key, (expires, _) = next(iter(cache.items()))
+            if expires > now and len(cache) <= DASHBOARD_CACHE_MAX_ENTRIES:
+                break
+            del cache[oldest_key]
+    return value
+
+
+def invalidate_dashboard_cache():
+    """
+    Drop all cached dashboard data; call after saving predictions.
+    
+    Only this process's cache is cleared (see _cached()).
+    """
+    current_app.extensions.pop('dashboard_cache', None)
+
 
 def get_real_dashboard_data():
     """
@@ -26,61 +104,45 @@ def get_real_dashboard_data():
         dict: Dashboard metrics and risk distribution data from database
     """
     try:
-        # Total predictions (as proxy for patients)
-        total_patients = db.session.query(func.count(PredictionHistory.id)).scalar() or 0
-        
-        # New cases in last 7 days
+        # One scan for every count: total predictions (as proxy for
+        # patients), new cases in the last 7 days and the risk distribution
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        new_cases = db.session.query(func.count(PredictionHistory.id)).filter(
-            PredictionHistory.created_at >= seven_days_ago
-        ).scalar() or 0
-        
-        # Risk distribution counts
-        risk_counts = db.session.query(
-            PredictionHistory.risk_level,
-            func.count(PredictionHistory.id)
-        ).group_by(PredictionHistory.risk_level).all()
-        
-        # Initialize counts
-        low_risk_count = 0
-        medium_risk_count = 0
-        high_risk_count = 0
-        critical_risk_count = 0
-        
-        # Map database results to counts
-        for risk_level, count in risk_counts:
-            if risk_level == 'low':
-                low_risk_count = count
-            elif risk_level == 'medium':
-                medium_risk_count = count
-            elif risk_level == 'high':
-                high_risk_count = count
-            elif risk_level == 'critical':
-                critical_risk_count = count
+        (
+            total_patients,
+            new_cases,
+            low_risk_count,
+            medium_risk_count,
+            high_risk_count,
+            critical_risk_count,
+        ) = db.session.query(
+            func.count(PredictionHistory.id),
+            func.count(case((PredictionHistory.created_at >= seven_days_ago, 1))),
+            func.count(case((PredictionHistory.risk_level == 'low', 1))),
+            func.count(case((PredictionHistory.risk_level == 'medium', 1))),
+            func.count(case((PredictionHistory.risk_level == 'high', 1))),
+            func.count(case((PredictionHistory.risk_level == 'critical', 1))),
+        ).one()
         
         # Calculate percentages (avoid division by zero)
         if total_patients > 0:
-            # Compute base integer percentages using floor division
-            counts = [
+            # Integer percentages by the largest remainder method, in exact
+            # integer arithmetic: floor each share, then give the missing
+            # points to the categories with the largest remainders
+            counts = (
                 low_risk_count,
                 medium_risk_count,
                 high_risk_count,
                 critical_risk_count,
-            ]
-            raw_percentages = [(c * 100.0) / total_patients for c in counts]
-            base_percentages = [int(p) for p in raw_percentages]
+            )
+            shares = [divmod(c * 100, total_patients) for c in counts]
+            base_percentages = [share for share, _ in shares]
             remainder = 100 - sum(base_percentages)
             
-            # Distribute remaining percentage points to categories with largest fractional parts
             if remainder > 0:
-                fractional_parts = [
-                    (p - int(p), idx) for idx, p in enumerate(raw_percentages)
-                ]
-                # Sort by descending fractional part so we add 1% to the largest fractions first
-                fractional_parts.sort(reverse=True)
+                # Largest remainder first; ties go to the later category
+                order = sorted(range(len(shares)), key=lambda i: (shares[i][1], i), reverse=True)
                 for i in range(remainder):
-                    idx = fractional_parts[i % len(fractional_parts)][1]
-                    base_percentages[idx] += 1
+                    base_percentages[order[i % len(order)]] += 1
             
             low_risk_pct, medium_risk_pct, high_risk_pct, critical_risk_pct = base_percentages
         else:
@@ -149,36 +211,36 @@ def get_patient_dashboard_data(user_id):
     Args:
         user_id: The ID of the currently logged-in user
         
+    Statistics cover all of the user's predictions; the predictions list
+    holds the RECENT_PREDICTIONS_LIMIT most recent ones.
+    
     Returns:
         dict: Patient-specific dashboard data
         
     Raises:
         Exception: Propagates database errors to caller for proper handling
     """
-    # Get all predictions for this user
-    user_predictions = PredictionHistory.query.filter_by(
-        user_id=user_id
-    ).order_by(PredictionHistory.created_at.desc()).all()
-    
-    total_predictions = len(user_predictions)
+    # Risk level counts; their sum is the total (including unknown levels)
+    risk_rows = db.session.query(
+        PredictionHistory.risk_level,
+        func.count(PredictionHistory.id)
+    ).filter_by(user_id=user_id).group_by(PredictionHistory.risk_level).all()
     
-    # Calculate risk level counts
+    total_predictions = sum(count for _, count in risk_rows)
     risk_counts = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
-    disease_counts = {}
+    for risk_level, count in risk_rows:
+        if risk_level in risk_counts:
+            risk_counts[risk_level] = count
     
-    for pred in user_predictions:
-        # Count risk levels
-        if pred.risk_level in risk_counts:
-            risk_counts[pred.risk_level] += 1
-        
-        # Count diseases
-        if pred.disease:
-            disease_counts[pred.disease] = disease_counts.get(pred.disease, 0) + 1
-    
-    # Find most common disease
-    most_common_disease = None
-    if disease_counts:
-        most_common_disease = max(disease_counts, key=disease_counts.get)
+    # Most common disease; ties go to the most recently predicted one
+    most_common_row = db.session.query(PredictionHistory.disease).filter(
+        PredictionHistory.user_id == user_id,
+        PredictionHistory.disease != ''
+    ).group_by(PredictionHistory.disease).order_by(
+        func.count(PredictionHistory.id).desc(),
+        func.max(PredictionHistory.created_at).desc()
+    ).first()
+    most_common_disease = most_common_row[0] if most_common_row else None
     
     # Calculate percentages
     if total_predictions > 0:
@@ -195,15 +257,22 @@ def get_patient_dashboard_data(user_id):
             for level in risk_counts
         }
     
+    # Most recent predictions, loading only the columns to_dict() uses
+    recent_predictions = PredictionHistory.query.options(
+        load_only(*PREDICTION_DICT_COLUMNS)
+    ).filter_by(
+        user_id=user_id
+    ).order_by(PredictionHistory.created_at.desc()).limit(RECENT_PREDICTIONS_LIMIT).all()
+    
     # Get last prediction date
     last_prediction_date = None
     last_disease = None
-    if user_predictions:
-        last_prediction_date = user_predictions[0].created_at.isoformat()
-        last_disease = user_predictions[0].disease
+    if recent_predictions:
+        last_prediction_date = recent_predictions[0].created_at.isoformat()
+        last_disease = recent_predictions[0].disease
     
     # Convert predictions to dict list
-    predictions_list = [pred.to_dict() for pred in user_predictions]
+    predictions_list = [pred.to_dict() for pred in recent_predictions]
         
     return {
         'statistics': {
@@ -240,7 +309,12 @@ def get_patient_data():
     }
     """
     try:
-        dashboard_data = get_patient_dashboard_data(current_user.id)
+        user_id = current_user.id
+        dashboard_data = _cached(
+            ('patient', user_id),
+            PATIENT_DASHBOARD_CACHE_TIMEOUT,
+            lambda: get_patient_dashboard_data(user_id)
+        )
         
         return jsonify({
             'success': True,
@@ -266,7 +340,8 @@ def get_dashboard_data():
     """
     API endpoint to fetch doctor dashboard data from database.
     
-    Returns aggregated patient metrics and risk distribution.
+    Returns aggregated patient metrics and risk distribution. The data is
+    cached for DOCTOR_DASHBOARD_CACHE_TIMEOUT seconds.
     
     Response JSON:
     {
@@ -287,7 +362,11 @@ def get_dashboard_data():
     }
     """
     try:
-        dashboard_data = get_real_dashboard_data()
+        dashboard_data = _cached(
+            'doctor',
+            DOCTOR_DASHBOARD_CACHE_TIMEOUT,
+            get_real_dashboard_data
+        )
         
         return jsonify({
             'success': True,
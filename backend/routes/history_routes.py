@@ -1,20 +1,37 @@
-from flask import Blueprint, render_template, abort
+from flask import Blueprint, render_template, abort, request
 from flask_login import login_required, current_user
+from sqlalchemy.orm import load_only
 from backend.models.prediction import PredictionHistory
 from backend import db
 
 history_bp = Blueprint('history', __name__)
 
+# Number of predictions shown per history page
+HISTORY_PER_PAGE = 25
+
+# Columns read by history.html
+HISTORY_COLUMNS = (
+    PredictionHistory.id,
+    PredictionHistory.disease,
+    PredictionHistory.risk_level,
+    PredictionHistory.ml_probability,
+    PredictionHistory.created_at,
+)
+
 @history_bp.route('/history', methods=['GET'])
 @login_required
 def get_history():
     """
     Fetch and display the prediction history for the current user.
-    Ordered by creation date descending (newest first).
+    Ordered by creation date descending (newest first), HISTORY_PER_PAGE
+    predictions per page (?page=N).
     """
-    # Query logic to fetch user-specific data
-    history = PredictionHistory.query.filter_by(user_id=current_user.id)\
+    page = request.args.get('page', 1, type=int)
+    
+    # Query logic to fetch one page of user-specific data
+    pagination = PredictionHistory.query.options(load_only(*HISTORY_COLUMNS))\
+        .filter_by(user_id=current_user.id)\
         .order_by(PredictionHistory.created_at.desc())\
-        .all()
+        .paginate(page=page, per_page=HISTORY_PER_PAGE, error_out=False)
     
-    return render_template('history.html', history=history)
+    return render_template('history.html', history=pagination.items, pagination=pagination)
@@ -1,35 +1,43 @@
-from flask import Blueprint, render_template, request, jsonify
+from flask import render_template, request, jsonify
 from backend.models.ml_model import ml_model
 from backend.utils.calculator import BayesCalculator
 from backend.models.prediction import PredictionHistory
+from backend.routes.doctor_routes import invalidate_dashboard_cache
 from backend import db
-import json
 import traceback
+from bisect import bisect_right
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import insert
+
+# URL rules for these views live in backend/routes/__init__.py (lazy blueprint)
+
+# P(symptoms | no disease) used for every Bayesian update
+FALSE_POSITIVE_RATE = 0.05
+
+@lru_cache(maxsize=1)
+def _disease_page_data():
+    """Disease names and symptoms for the prediction page, built once."""
+    return {
+        disease: {
+            'name': disease.replace('_', ' ').title(),
+            'symptoms': ml_model.get_disease_symptoms(disease)
+        }
+        for disease in ml_model.get_available_diseases()
+    }
 
-ml_bp = Blueprint('ml', __name__)
 
-@ml_bp.route('/ml-prediction')
 def ml_prediction_page():
     """Render the ML prediction page"""
     try:
         # Get available diseases and their symptoms
-        diseases = ml_model.get_available_diseases()
-        disease_data = {}
-        
-        for disease in diseases:
-            disease_data[disease] = {
-                'name': disease.replace('_', ' ').title(),
-                'symptoms': ml_model.get_disease_symptoms(disease)
-            }
-        
         return render_template('ml_prediction.html', 
-                             diseases=disease_data,
+                             diseases=_disease_page_data(),
                              active_page='ml_prediction')
     except Exception as e:
         return render_template('error.html', error=str(e)), 500
 
 
-@ml_bp.route('/api/ml/predict', methods=['POST'])
 def predict_disease():
     """
     API endpoint for ML disease prediction.
@@ -69,18 +77,22 @@ def predict_disease():
         if not symptoms or len(symptoms) == 0:
             return jsonify({'error': 'No symptoms provided'}), 400
         
+        # Build the symptom set once for both the prediction and the missing-symptom analysis
+        symptom_set = frozenset(symptoms)
+        
         # Get ML prediction
-        ml_prediction = ml_model.predict_disease_probability(disease, symptoms, age=age, height_cm=height, weight_kg=weight)
+        ml_prediction = ml_model.predict_disease_probability(disease, symptoms, age=age, height_cm=height, weight_kg=weight,
+                                                             symptom_set=symptom_set)
         
         # Get missing symptom analysis
-        missing_symptoms = ml_model.analyze_missing_symptoms(disease, symptoms)
+        missing_symptoms = ml_model.analyze_missing_symptoms(disease, symptom_set)
         
         # Calculate Bayesian probabilities
         calculator = BayesCalculator()
         bayesian_result = calculator.calculate_posterior(
             prior=ml_prediction['prior_probability'],
             likelihood=ml_prediction['likelihood'],
-            false_positive_rate=0.05
+            false_positive_rate=FALSE_POSITIVE_RATE
         )
         
         # Determine risk level for storage
@@ -90,17 +102,19 @@ def predict_disease():
         
         # Save prediction to database
         try:
-            prediction_record = PredictionHistory(
-                disease=disease,
-                symptoms=json.dumps(symptoms),
-                patient_age=age,
-                ml_probability=ml_prediction['raw_probability'],
-                bayesian_posterior=bayesian_result['posterior'],
-                confidence_score=ml_prediction['confidence_score'],
-                risk_level=risk_level_db
-            )
-            db.session.add(prediction_record)
+            # Bulk-style INSERT: the row is never read back in this request,
+            # so skip building a tracked ORM instance for it
+            db.session.execute(insert(PredictionHistory), [{
+                'disease': disease,
+                'symptoms': symptoms,
+                'patient_age': age,
+                'ml_probability': ml_prediction['raw_probability'],
+                'bayesian_posterior': bayesian_result['posterior'],
+                'confidence_score': ml_prediction['confidence_score'],
+                'risk_level': risk_level_db
+            }])
             db.session.commit()
+            invalidate_dashboard_cache()
             print(f"✅ Prediction saved: disease={disease}, risk_level={risk_level_db}")
         except Exception as db_error:
             # Log error but don't fail the prediction
@@ -137,7 +151,6 @@ def predict_disease():
         return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
 
 
-@ml_bp.route('/api/ml/predict-multiple', methods=['POST'])
 def predict_multiple_diseases():
     """
     API endpoint for differential diagnosis (predict multiple diseases).
@@ -161,24 +174,26 @@ def predict_multiple_diseases():
         # Get predictions for all diseases
         predictions = ml_model.predict_multiple_diseases(symptoms)
         
-        # Format results
-        results = []
-        calculator = BayesCalculator()
+        # Bayesian posteriors for every disease at once (same formula as
+        # BayesCalculator.calculate_posterior; the model keeps priors in
+        # [0.05, 0.95] and likelihoods in [0.75, 0.95], so the denominator is
+        # never zero)
+        priors = np.fromiter((p['prior_probability'] for p in predictions), np.float64, len(predictions))
+        likelihoods = np.fromiter((p['likelihood'] for p in predictions), np.float64, len(predictions))
+        numerators = likelihoods * priors
+        posteriors = (numerators / (numerators + FALSE_POSITIVE_RATE * (1 - priors)) * 100).tolist()
         
-        for pred in predictions:
-            bayesian = calculator.calculate_posterior(
-                prior=pred['prior_probability'],
-                likelihood=pred['likelihood'],
-                false_positive_rate=0.05
-            )
-            
-            results.append({
+        # Format results
+        results = [
+            {
                 'disease': pred['disease'].replace('_', ' ').title(),
                 'probability': round(pred['raw_probability'] * 100, 2),
-                'posterior': round(bayesian['posterior'] * 100, 2),
+                'posterior': round(posterior, 2),
                 'confidence': round(pred['confidence_score'] * 100, 2),
-                'risk_level': get_risk_level(bayesian['posterior'] * 100)
-            })
+                'risk_level': get_risk_level(posterior)
+            }
+            for pred, posterior in zip(predictions, posteriors)
+        ]
         
         return jsonify({
             'success': True,
@@ -190,41 +205,64 @@ def predict_multiple_diseases():
         return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
 
 
-@ml_bp.route('/api/ml/diseases', methods=['GET'])
+# The model is fixed for the life of the process, so the listing responses
+# below are built once. The per-disease caches are keyed on the model's
+# canonical disease key (resolve it with ml_model._get_disease_key(), which
+# raises ValueError for unknown names), so they hold at most one entry per
+# disease however the name is spelled in the URL.
+
+@lru_cache(maxsize=1)
+def _disease_list():
+    """Keys and display names of all diseases."""
+    return [
+        {
+            'key': disease,
+            'name': disease.replace('_', ' ').title()
+        }
+        for disease in ml_model.get_available_diseases()
+    ]
+
+
+@lru_cache(maxsize=None)
+def _symptom_list(disease):
+    """Symptom keys and display names for a canonical disease key."""
+    return [
+        {
+            'key': key,
+            'name': name
+        }
+        for key, name in ml_model.get_disease_symptoms(disease).items()
+    ]
+
+
+@lru_cache(maxsize=None)
+def _importance_list(disease):
+    """Symptom importance percentages for a canonical disease key."""
+    return [
+        {
+            'symptom': symptom,
+            'importance': round(weight * 100, 1)
+        }
+        for symptom, weight in ml_model.get_symptom_importance(disease).items()
+    ]
+
+
 def get_diseases():
     """Get list of available diseases"""
     try:
-        diseases = ml_model.get_available_diseases()
-        disease_list = [
-            {
-                'key': disease,
-                'name': disease.replace('_', ' ').title()
-            }
-            for disease in diseases
-        ]
-        
         return jsonify({
             'success': True,
-            'diseases': disease_list
+            'diseases': _disease_list()
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@ml_bp.route('/api/ml/symptoms/<disease>', methods=['GET'])
 def get_disease_symptoms(disease):
     """Get symptoms for a specific disease"""
     try:
-        symptoms = ml_model.get_disease_symptoms(disease.lower())
-        
-        symptom_list = [
-            {
-                'key': key,
-                'name': name
-            }
-            for key, name in symptoms.items()
-        ]
+        symptom_list = _symptom_list(ml_model._get_disease_key(disease))
         
         return jsonify({
             'success': True,
@@ -238,19 +276,10 @@ def get_disease_symptoms(disease):
         return jsonify({'error': str(e)}), 500
 
 
-@ml_bp.route('/api/ml/symptom-importance/<disease>', methods=['GET'])
 def get_symptom_importance(disease):
     """Get symptom importance/weights for a disease"""
     try:
-        importance = ml_model.get_symptom_importance(disease.lower())
-        
-        importance_list = [
-            {
-                'symptom': symptom,
-                'importance': round(weight * 100, 1)
-            }
-            for symptom, weight in importance.items()
-        ]
+        importance_list = _importance_list(ml_model._get_disease_key(disease))
         
         return jsonify({
             'success': True,
@@ -264,6 +293,33 @@ def get_symptom_importance(disease):
         return jsonify({'error': str(e)}), 500
 
 
+# Upper bounds (exclusive) of the Low, Moderate and High risk bands, in percent
+_RISK_THRESHOLDS = (30, 60, 85)
+
+_RISK_LEVELS = (
+    {
+        'level': 'Low',
+        'color': 'success',
+        'description': 'Low probability of disease'
+    },
+    {
+        'level': 'Moderate',
+        'color': 'warning',
+        'description': 'Moderate probability - consider further testing'
+    },
+    {
+        'level': 'High',
+        'color': 'danger',
+        'description': 'High probability - immediate medical consultation recommended'
+    },
+    {
+        'level': 'Critical',
+        'color': 'dark',
+        'description': 'Critical risk level - urgent medical attention required'
+    },
+)
+
+
 def get_risk_level(probability):
     """
     Determine risk level based on probability percentage.
@@ -272,29 +328,6 @@ def get_risk_level(probability):
         probability: Probability percentage (0-100)
     
     Returns:
-        Dictionary with risk level and color
+        Dictionary with risk level and color (shared; do not modify)
     """
-    if probability < 30:
-        return {
-            'level': 'Low',
-            'color': 'success',
-            'description': 'Low probability of disease'
-        }
-    elif probability < 60:
-        return {
-            'level': 'Moderate',
-            'color': 'warning',
-            'description': 'Moderate probability - consider further testing'
-        }
-    elif probability < 85:
-        return {
-            'level': 'High',
-            'color': 'danger',
-            'description': 'High probability - immediate medical consultation recommended'
-        }
-    else:
-        return {
-            'level': 'Critical',
-            'color': 'dark',
-            'description': 'Critical risk level - urgent medical attention required'
-        }
\ No newline at end of file
+    return _RISK_LEVELS[bisect_right(_RISK_THRESHOLDS, probability)]
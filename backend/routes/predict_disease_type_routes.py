@@ -18,14 +18,15 @@ warnings.filterwarnings(
 
 import numpy as np
 import os
+import threading
 from PIL import Image
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
 import tensorflow as tf
 
 # Suppress TensorFlow logging
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 
-predict_disease_type_bp = Blueprint("disease-type", __name__)
+# URL rules for these views live in backend/routes/__init__.py (lazy blueprint)
 
 # CONFIG 
 BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -100,7 +101,13 @@ def load_tflite_model(model_type):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Model not found: {path}")
 
-        interpreter = tf.lite.Interpreter(model_path=path)
+        # XNNPACK is applied by default for float and int8 models; let it use
+        # more than one core when TFLITE_NUM_THREADS is set
+        num_threads = os.environ.get("TFLITE_NUM_THREADS")
+        interpreter = tf.lite.Interpreter(
+            model_path=path,
+            num_threads=int(num_threads) if num_threads else None
+        )
         interpreter.allocate_tensors()
 
         TFLITE_MODEL_CACHE[model_type] = {
@@ -110,25 +117,51 @@ def load_tflite_model(model_type):
         }
     return TFLITE_MODEL_CACHE[model_type]
 
+# loads every configured model and runs one dummy inference through each,
+# so the first real request does not pay for loading and graph setup
+def preload_models():
+    for model_type, config in MODEL_CONFIG.items():
+        dummy = np.zeros((1, *config["img_size"], 3), dtype=np.float32)
+        if config["format"] == "keras":
+            run_keras_inference(model_type, dummy)
+        else:
+            run_tflite_inference(model_type, dummy)
+
+# ImageNet channel means in BGR order, as subtracted by
+# tf.keras.applications.resnet50.preprocess_input ("caffe" mode)
+RESNET_BGR_MEAN = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+
+# Per-thread input buffers, keyed by image size; inference copies the input,
+# so a buffer can be reused by the next request on the same thread
+_input_buffers = threading.local()
+
 # preprocesses image for model input
 def preprocess_image(file, model_type):
     config = MODEL_CONFIG[model_type]
     size = config["img_size"]
 
-    img = Image.open(file).convert("RGB")
+    # Large JPEGs (camera photos) are decoded at a reduced DCT scale that is
+    # still at least the model size; other formats ignore draft()
+    img = Image.open(file)
+    img.draft("RGB", size)
+    img = img.convert("RGB")
     img = img.resize(size)
 
-    img_array = np.array(img, dtype=np.float32)
-    img_array = np.expand_dims(img_array, axis=0)
+    buffers = _input_buffers.__dict__
+    img_array = buffers.get(size)
+    if img_array is None:
+        img_array = buffers[size] = np.empty((1, size[1], size[0], 3), dtype=np.float32)
 
-    # ResNet-style normalization (works for both models)
-    img_array = tf.keras.applications.resnet50.preprocess_input(img_array)
+    # ResNet-style normalization (works for both models): RGB -> BGR, then
+    # subtract the channel means, written straight into the batch buffer
+    np.subtract(np.asarray(img)[:, :, ::-1], RESNET_BGR_MEAN, out=img_array[0], dtype=np.float32)
     return img_array
 
 # runs and predicts output for keras model
 def run_keras_inference(model_type, img_array):
     model = load_keras_model(model_type)
-    preds = model.predict(img_array)[0]
+    # Direct call: predict() sets up a batching data pipeline on every call
+    preds = model(img_array, training=False).numpy()[0]
     return preds
 
 # runs and predicts output for tflite model
@@ -138,19 +171,25 @@ def run_tflite_inference(model_type, img_array):
     input_details = model_data["input_details"]
     output_details = model_data["output_details"]
 
-    # Handle INT8 vs float model
-    if MODEL_CONFIG[model_type].get("dtype") == "uint8":
-        img_array = img_array.astype(np.uint8)
+    # Fully quantized (int8/uint8) models take and return integer tensors;
+    # map through their scale and zero point
+    input_dtype = input_details[0]["dtype"]
+    if np.issubdtype(input_dtype, np.integer):
+        scale, zero_point = input_details[0]["quantization"]
+        info = np.iinfo(input_dtype)
+        img_array = np.clip(np.round(img_array / scale + zero_point), info.min, info.max).astype(input_dtype)
 
     interpreter.set_tensor(input_details[0]["index"], img_array)
     interpreter.invoke()
 
     preds = interpreter.get_tensor(output_details[0]["index"])[0]
+    if np.issubdtype(preds.dtype, np.integer):
+        scale, zero_point = output_details[0]["quantization"]
+        preds = (preds.astype(np.float32) - zero_point) * scale
     return preds
 
 
 #  Main prediction route
-@predict_disease_type_bp.route("/predict", methods=["POST"])
 def predict():
     # Accept file as "image" or "file"
     if "image" not in request.files:
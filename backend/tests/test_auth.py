@@ -0,0 +1,72 @@
+"""
+Tests for the authentication routes.
+Tests signup and case-insensitive email login.
+"""
+
+import pytest
+from backend import create_app, db
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Create a test application on an in-memory database with cheap password hashing."""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    monkeypatch.setenv('BCRYPT_LOG_ROUNDS', '4')
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def signup(client, email, username='elise'):
+    return client.post('/signup', data={
+        'username': username,
+        'email': email,
+        'password': 'secret-password',
+    })
+
+
+def login(client, email):
+    return client.post('/login', data={'email': email, 'password': 'secret-password'})
+
+
+class TestEmailLogin:
+    """Tests for email matching at login and signup."""
+
+    @pytest.mark.parametrize('email', ['ELISE@example.com', 'ÉLISE@example.com'])
+    def test_login_with_signup_email(self, client, email):
+        """Test that the exact email used at signup logs in, including non-ASCII letters."""
+        signup(client, email)
+        response = login(client, email)
+        assert response.status_code == 302
+        assert '/profile' in response.headers['Location']
+
+    def test_login_ignores_ascii_case(self, client):
+        """Test that login matches the email case-insensitively."""
+        signup(client, 'Elise@Example.com')
+        response = login(client, 'elise@example.com')
+        assert '/profile' in response.headers['Location']
+
+    def test_wrong_password_rejected(self, client):
+        """Test that a wrong password stays on the login page."""
+        signup(client, 'elise@example.com')
+        response = client.post('/login', data={'email': 'elise@example.com', 'password': 'wrong'})
+        assert '/profile' not in response.headers['Location']
+
+    def test_duplicate_email_rejected(self, client, app):
+        """Test that signing up twice with the same email in another case is refused."""
+        from backend.models.user import User
+
+        signup(client, 'elise@example.com')
+        signup(client, 'ELISE@example.com', username='elise2')
+        with app.app_context():
+            assert User.query.count() == 1
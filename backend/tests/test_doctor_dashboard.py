@@ -8,14 +8,16 @@ import json
 from datetime import datetime, timedelta
 from backend import create_app, db
 from backend.models.prediction import PredictionHistory
+from backend.routes.doctor_routes import get_patient_dashboard_data
 
 
 @pytest.fixture
-def app():
+def app(monkeypatch):
     """Create and configure a test application instance."""
+    # The engine is created in create_app(), so the URI must be set before it
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
     app = create_app()
     app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     
     with app.app_context():
         db.create_all()
@@ -150,6 +152,42 @@ class TestDoctorDashboardAPI:
         data = json.loads(response.data)
         
         assert data['data']['critical_risk_count'] == 1
+    
+    def test_dashboard_cached_until_prediction_saved(self, client, app):
+        """Test that cached data is served until the predict endpoint saves a row."""
+        client.get('/api/doctor/dashboard')
+        
+        with app.app_context():
+            db.session.add(PredictionHistory(disease='flu', symptoms=[], ml_probability=0.2, risk_level='low'))
+            db.session.commit()
+        
+        data = json.loads(client.get('/api/doctor/dashboard').data)
+        assert data['data']['total_patients'] == 0
+        
+        client.post('/api/ml/predict', json={'disease': 'diabetes', 'symptoms': ['fatigue']})
+        
+        data = json.loads(client.get('/api/doctor/dashboard').data)
+        assert data['data']['total_patients'] == 2
+    
+    def test_cache_drops_expired_and_excess_entries(self, app, monkeypatch):
+        """Test that expired entries are removed and the cache size is capped."""
+        from backend.routes import doctor_routes
+        
+        clock = [100.0]
+        monkeypatch.setattr(doctor_routes.time, 'monotonic', lambda: clock[0])
+        monkeypatch.setattr(doctor_routes, 'DASHBOARD_CACHE_MAX_ENTRIES', 3)
+        
+        with app.app_context():
+            doctor_routes._cached(('patient', 1), 30, lambda: 'one')
+            clock[0] += 31
+            doctor_routes._cached(('patient', 2), 30, lambda: 'two')
+            cache = app.extensions['dashboard_cache']
+            assert list(cache) == [('patient', 2)]
+            
+            for user_id in (3, 4, 5):
+                doctor_routes._cached(('patient', user_id), 30, lambda: 'more')
+            assert list(cache) == [('patient', 3), ('patient', 4), ('patient', 5)]
+            assert doctor_routes._cached(('patient', 5), 30, lambda: 'new') == 'more'
 
 
 class TestPredictionPersistence:
@@ -247,6 +285,41 @@ class TestPredictionHistoryModel:
             symptoms = prediction.get_symptoms_list()
             assert symptoms == []
     
+    def test_get_symptoms_list_follows_updates(self, app):
+        """Test that the parsed list is reused and refreshed when symptoms change."""
+        with app.app_context():
+            prediction = PredictionHistory(
+                disease='test',
+                symptoms=json.dumps(['symptom1']),
+                ml_probability=0.5,
+                risk_level='medium'
+            )
+            
+            assert prediction.get_symptoms_list() is prediction.get_symptoms_list()
+            
+            prediction.symptoms = json.dumps(['symptom2'])
+            assert prediction.get_symptoms_list() == ['symptom2']
+            
+            prediction.set_symptoms_list(['symptom3'])
+            assert prediction.get_symptoms_list() == ['symptom3']
+    
+    def test_symptoms_list_round_trip(self, app):
+        """Test that a symptoms list is stored natively and read back as a list."""
+        with app.app_context():
+            prediction = PredictionHistory(
+                disease='test',
+                symptoms=['symptom1', 'symptom2'],
+                ml_probability=0.5,
+                risk_level='medium'
+            )
+            db.session.add(prediction)
+            db.session.commit()
+            db.session.expire_all()
+            
+            stored = PredictionHistory.query.first()
+            assert stored.symptoms == ['symptom1', 'symptom2']
+            assert stored.get_symptoms_list() == ['symptom1', 'symptom2']
+    
     def test_to_dict(self, app):
         """Test that to_dict returns correct structure."""
         with app.app_context():
@@ -268,6 +341,64 @@ class TestPredictionHistoryModel:
             assert 'created_at' in data
 
 
+class TestPatientDashboardData:
+    """Tests for the per-user dashboard aggregation."""
+    
+    def _add(self, disease, risk_level, minutes_ago, user_id=1):
+        db.session.add(PredictionHistory(
+            user_id=user_id,
+            disease=disease,
+            symptoms=['fatigue'],
+            ml_probability=0.5,
+            risk_level=risk_level,
+            created_at=datetime.utcnow() - timedelta(minutes=minutes_ago)
+        ))
+    
+    def test_statistics(self, app):
+        """Test counts, most common disease and the latest prediction."""
+        with app.app_context():
+            self._add('flu', 'low', 30)
+            self._add('diabetes', 'high', 20)
+            self._add('diabetes', 'critical', 10)
+            self._add('flu', 'low', 5)
+            self._add('asthma', 'high', 1, user_id=2)
+            db.session.commit()
+            
+            data = get_patient_dashboard_data(1)
+        
+        stats = data['statistics']
+        assert stats['total_predictions'] == 4
+        assert stats['high_risk_count'] == 1
+        assert stats['critical_risk_count'] == 1
+        # flu and diabetes are tied; flu was predicted most recently
+        assert stats['most_common_disease'] == 'flu'
+        assert stats['last_disease'] == 'flu'
+        assert data['risk_distribution']['low'] == {'count': 2, 'percentage': 50.0}
+        assert [p['disease'] for p in data['predictions']] == ['flu', 'diabetes', 'diabetes', 'flu']
+    
+    def test_no_predictions(self, app):
+        """Test the empty dashboard."""
+        with app.app_context():
+            data = get_patient_dashboard_data(1)
+        
+        assert data['statistics']['total_predictions'] == 0
+        assert data['statistics']['most_common_disease'] is None
+        assert data['statistics']['last_prediction_date'] is None
+        assert data['predictions'] == []
+
+
+class TestInitDb:
+    """Tests for table creation at app startup."""
+    
+    def test_each_in_memory_app_gets_tables(self, monkeypatch):
+        """Test that every app on an in-memory SQLite database has its tables."""
+        monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+        for _ in range(2):
+            app = create_app()
+            with app.app_context():
+                assert PredictionHistory.query.count() == 0
+
+
 class TestDoctorDashboardPage:
     """Tests for the Doctor Dashboard page rendering."""
     
@@ -0,0 +1,218 @@
+"""
+Tests for the centralized error handling middleware.
+Tests error response bodies, status codes, and headers.
+"""
+
+import pytest
+import json
+from flask import Flask, abort
+from backend.middleware.error_handler import (
+    ErrorHandler,
+    ValidationError,
+    NotFoundError,
+    RateLimitError,
+    validate_json_request,
+    require_fields,
+    json_request,
+    success_response,
+    error_response,
+)
+
+
+@pytest.fixture
+def app():
+    """Create a minimal application with the error handler installed."""
+    app = Flask(__name__)
+    ErrorHandler(app)
+
+    @app.route('/validation')
+    def validation():
+        raise ValidationError("Invalid symptom", field='symptoms')
+
+    @app.route('/not-found')
+    def not_found():
+        raise NotFoundError('Disease', 'unknown_disease')
+
+    @app.route('/rate-limited')
+    def rate_limited():
+        raise RateLimitError(retry_after=30)
+
+    @app.route('/bad-request')
+    def bad_request():
+        abort(400)
+
+    @app.route('/unauthorized')
+    def unauthorized():
+        abort(401)
+
+    @app.route('/crash')
+    def crash():
+        raise RuntimeError("boom")
+
+    @app.route('/predict', methods=['POST'])
+    @validate_json_request
+    @require_fields('disease', 'symptoms')
+    def predict():
+        return {'ok': True}
+
+    @app.route('/predict-combined', methods=['POST'])
+    @json_request('disease', 'symptoms')
+    def predict_combined(json_data):
+        return {'disease': json_data['disease']}
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+class TestAppErrors:
+    """Tests for AppError subclasses raised from views."""
+
+    def test_validation_error_body(self, client):
+        """Test that validation errors return 400 with the field name."""
+        response = client.get('/validation')
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['error'] == 'ValidationError'
+        assert data['message'] == 'Invalid symptom'
+        assert data['field'] == 'symptoms'
+        assert 'timestamp' in data
+
+    def test_not_found_error_body(self, client):
+        """Test that NotFoundError returns 404 with resource details."""
+        response = client.get('/not-found')
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert data['resource'] == 'Disease'
+        assert data['resource_id'] == 'unknown_disease'
+
+    def test_rate_limit_error_sets_retry_after(self, client):
+        """Test that rate limit errors set the Retry-After header."""
+        response = client.get('/rate-limited')
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '30'
+        assert json.loads(response.data)['retry_after'] == 30
+
+
+class TestHttpErrors:
+    """Tests for the HTTP status code handlers."""
+
+    def test_bad_request_body(self, client):
+        """Test that 400 responses are valid JSON."""
+        response = client.get('/bad-request')
+        assert response.status_code == 400
+        assert response.mimetype == 'application/json'
+        data = json.loads(response.data)
+        assert data['error'] == 'BadRequest'
+        assert 'timestamp' in data
+
+    def test_unknown_route_returns_json_404(self, client):
+        """Test that unknown routes return a JSON 404 with the path."""
+        response = client.get('/does-not-exist')
+        assert response.status_code == 404
+        assert json.loads(response.data)['path'] == '/does-not-exist'
+
+    def test_method_not_allowed(self, client):
+        """Test that wrong methods return 405 with method details."""
+        response = client.post('/validation')
+        assert response.status_code == 405
+        assert json.loads(response.data)['method'] == 'POST'
+
+    def test_other_http_errors_keep_status(self, client):
+        """Test that HTTP errors without a dedicated handler are not turned into 500s."""
+        response = client.get('/unauthorized')
+        assert response.status_code == 401
+
+    def test_unexpected_error_hides_details(self, client):
+        """Test that uncaught exceptions return a generic 500 body."""
+        response = client.get('/crash')
+        assert response.status_code == 500
+        data = json.loads(response.data)
+        assert data['error'] == 'InternalServerError'
+        assert 'boom' not in data['message']
+
+
+class TestRequestDecorators:
+    """Tests for the JSON validation decorators."""
+
+    def test_valid_request_passes(self, client):
+        """Test that a JSON body with all required fields reaches the view."""
+        response = client.post('/predict', json={'disease': 'flu', 'symptoms': ['fever']})
+        assert response.status_code == 200
+
+    def test_malformed_json_rejected(self, client):
+        """Test that malformed JSON is rejected with 400."""
+        response = client.post('/predict', data='{bad', content_type='application/json')
+        assert response.status_code == 400
+
+    def test_missing_fields_rejected(self, client):
+        """Test that missing required fields are rejected with 400."""
+        response = client.post('/predict', json={'disease': 'flu'})
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'ValidationError'
+
+    def test_json_request_passes_parsed_body(self, client):
+        """Test that json_request hands the parsed body to the view."""
+        response = client.post('/predict-combined', json={'disease': 'flu', 'symptoms': []})
+        assert response.status_code == 200
+        assert json.loads(response.data)['disease'] == 'flu'
+
+    def test_json_request_reports_missing_fields(self, client):
+        """Test that json_request lists the missing fields."""
+        response = client.post('/predict-combined', json={'disease': 'flu'})
+        assert response.status_code == 400
+        assert json.loads(response.data)['missing_fields'] == ['symptoms']
+
+    def test_json_request_rejects_non_json(self, client):
+        """Test that json_request rejects form bodies."""
+        response = client.post('/predict-combined', data={'disease': 'flu'})
+        assert response.status_code == 400
+
+
+class TestResponseHelpers:
+    """Tests for the standardized response helpers."""
+
+    def test_success_response_without_data(self, app):
+        """Test the constant success body."""
+        with app.test_request_context():
+            response, status_code = success_response()
+            data = json.loads(response.get_data())
+        assert status_code == 200
+        assert response.status_code == 200
+        assert data['success'] is True
+        assert 'timestamp' in data
+
+    def test_success_response_with_data(self, app):
+        """Test that data and message are included."""
+        with app.test_request_context():
+            response, status_code = success_response({'count': 3}, message='Done', status_code=201)
+            data = json.loads(response.get_data())
+        assert status_code == 201
+        assert response.status_code == 201
+        assert data['data'] == {'count': 3}
+        assert data['message'] == 'Done'
+
+    def test_error_response(self, app):
+        """Test error bodies with and without extra fields."""
+        with app.test_request_context():
+            plain, plain_status = error_response('Unauthorized', 401)
+            detailed, detailed_status = error_response('Invalid field', field='age')
+            plain_data = json.loads(plain.get_data())
+            detailed_data = json.loads(detailed.get_data())
+        assert plain_status == plain.status_code == 401
+        assert plain_data['success'] is False
+        assert plain_data['error'] == 'Unauthorized'
+        assert detailed_status == detailed.status_code == 400
+        assert detailed_data['field'] == 'age'
+
+    def test_timestamp_shared_within_request(self, app):
+        """Test that one request reuses a single timezone-aware UTC timestamp."""
+        with app.test_request_context():
+            first = json.loads(error_response('Unauthorized', 401)[0].get_data())['timestamp']
+            second = json.loads(success_response()[0].get_data())['timestamp']
+        assert first == second
+        assert first.endswith('+00:00')
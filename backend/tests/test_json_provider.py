@@ -0,0 +1,47 @@
+"""
+Tests for the orjson-backed JSON provider.
+Tests response bodies, key ordering, and NumPy serialization.
+"""
+
+import pytest
+import numpy as np
+from flask import Flask, jsonify
+from backend.utils.json_provider import ORJSONProvider
+
+
+@pytest.fixture
+def app():
+    """Create a minimal application using the orjson provider."""
+    app = Flask(__name__)
+    app.json = ORJSONProvider(app)
+    return app
+
+
+class TestORJSONProvider:
+    """Tests for ORJSONProvider."""
+
+    def test_response_body(self, app):
+        """Test that jsonify returns compact, sorted JSON with a trailing newline."""
+        with app.test_request_context():
+            response = jsonify({'b': 1, 'a': 'x'})
+        assert response.mimetype == 'application/json'
+        assert response.get_data() == b'{"a":"x","b":1}\n'
+
+    def test_response_indented_in_debug(self, app):
+        """Test that debug mode pretty-prints the body."""
+        app.debug = True
+        with app.test_request_context():
+            response = jsonify(a=1)
+        assert response.get_data() == b'{\n  "a": 1\n}\n'
+
+    def test_numpy_values(self, app):
+        """Test that NumPy arrays and scalars serialize without conversion."""
+        with app.test_request_context():
+            response = jsonify({'scores': np.array([0.5, 0.25]), 'count': np.int64(3)})
+        assert response.get_json() == {'scores': [0.5, 0.25], 'count': 3}
+
+    def test_dumps_and_loads(self, app):
+        """Test the text round trip used outside responses."""
+        text = app.json.dumps({1: 'one'})
+        assert text == '{"1":"one"}'
+        assert app.json.loads(text) == {'1': 'one'}
@@ -0,0 +1,206 @@
+"""
+Tests for the structured logging middleware.
+Tests JSON log record formatting and level gating.
+"""
+
+import logging
+import json
+import sys
+import time
+from flask import Flask, g
+from backend.middleware import logger as logger_module
+from backend.middleware.logger import (
+    JsonFormatter,
+    StructuredLogger,
+    RequestLogger,
+    log_request,
+    log_prediction_request,
+)
+
+
+def make_record(message='Prediction: flu', exc_info=None, **extra):
+    """Build a log record with optional extra fields."""
+    record = logging.LogRecord(
+        'disease_prediction', logging.INFO, __file__, 1, message, (), exc_info
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    """Tests for the JSON log formatter."""
+
+    def test_basic_fields(self):
+        """Test that the standard fields are present and reserved ones are not."""
+        record = make_record()
+        logging.Formatter('%(asctime)s %(message)s').format(record)
+        data = json.loads(JsonFormatter().format(record))
+        assert data['level'] == 'INFO'
+        assert data['logger'] == 'disease_prediction'
+        assert data['message'] == 'Prediction: flu'
+        assert data['timestamp'].endswith('Z')
+        assert 'levelno' not in data
+        assert 'args' not in data
+        assert 'asctime' not in data
+
+    def test_timestamp_from_record_created(self):
+        """Test that the timestamp is the record creation time in UTC."""
+        formatter = JsonFormatter()
+        record = make_record()
+        record.created, record.msecs = 1700000000.25, 250.0
+        assert json.loads(formatter.format(record))['timestamp'] == '2023-11-14T22:13:20.250Z'
+        record.created, record.msecs = 1700000001.0, 0.0
+        assert json.loads(formatter.format(record))['timestamp'] == '2023-11-14T22:13:21.000Z'
+
+    def test_extra_fields_included(self):
+        """Test that extra fields are written to the record."""
+        data = json.loads(JsonFormatter().format(make_record(disease='flu', duration_ms=1.5)))
+        assert data['disease'] == 'flu'
+        assert data['duration_ms'] == 1.5
+
+    def test_context_dict_merged(self):
+        """Test that a StructuredLogger context dict is merged as top-level fields."""
+        record = make_record(_ctx={'disease': 'flu', 'name': 'shadowed'})
+        data = json.loads(JsonFormatter().format(record))
+        assert data['disease'] == 'flu'
+        assert data['name'] == 'shadowed'
+        assert '_ctx' not in data
+
+    def test_non_serializable_extra_falls_back_to_str(self):
+        """Test that unknown types do not break formatting."""
+        data = json.loads(JsonFormatter().format(make_record(path=object)))
+        assert data['path'] == str(object)
+
+    def test_exception_included(self):
+        """Test that exception tracebacks are formatted."""
+        try:
+            raise ValueError('bad input')
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        data = json.loads(JsonFormatter().format(record))
+        assert 'ValueError: bad input' in data['exception']
+
+
+class TestStructuredLogger:
+    """Tests for the StructuredLogger wrappers."""
+
+    def test_disabled_level_skips_context(self, tmp_path, monkeypatch):
+        """Test that records below the logger level never build request context."""
+        logger = StructuredLogger('test_disabled_level', log_dir=str(tmp_path))
+        logger.logger.setLevel(logging.WARNING)
+
+        def fail(extra=None):
+            raise AssertionError('context built for a dropped record')
+
+        monkeypatch.setattr(logger, '_add_context', fail)
+        logger.debug('ignored')
+        logger.info('ignored')
+        logger.log_api_request('/api/ml/predict', 'POST', 200, 0.01)
+        logger.log_security_event('rate_limit', 'ignored', severity='info')
+
+    def test_context_outside_request(self, tmp_path):
+        """Test that context is returned unchanged outside a request."""
+        logger = StructuredLogger('test_no_request', log_dir=str(tmp_path))
+        assert logger._add_context({'disease': 'flu'}) == {'disease': 'flu'}
+
+    def test_context_inside_request(self, tmp_path):
+        """Test that request details are added inside a request."""
+        logger = StructuredLogger('test_request', log_dir=str(tmp_path))
+        app = Flask(__name__)
+        with app.test_request_context('/api/ml/predict', method='POST'):
+            context = logger._add_context({})
+            again = logger._add_context({'disease': 'flu'})
+        assert context['path'] == '/api/ml/predict'
+        assert context['method'] == 'POST'
+        assert again['path'] == '/api/ml/predict'
+        assert again['disease'] == 'flu'
+        assert 'disease' not in context
+
+    def test_file_logs_written_on_shutdown(self, tmp_path):
+        """Test that queued records reach the per-level log files."""
+        logger = StructuredLogger('test_file_logs', log_dir=str(tmp_path))
+        logger.info('Prediction: flu', disease='flu')
+        try:
+            raise ValueError('bad input')
+        except ValueError:
+            logger.logger.exception('Prediction failed')
+        logger.shutdown()
+
+        app_lines = (tmp_path / 'app.log').read_text().splitlines()
+        error_lines = (tmp_path / 'error.log').read_text().splitlines()
+        assert len(app_lines) == 2
+        assert json.loads(app_lines[0])['disease'] == 'flu'
+        assert len(error_lines) == 1
+        assert 'ValueError: bad input' in json.loads(error_lines[0])['exception']
+
+    def test_file_logs_flushed_when_idle(self, tmp_path):
+        """Test that a record reaches disk once the queue drains, without shutdown()."""
+        logger = StructuredLogger('test_file_logs_idle', log_dir=str(tmp_path))
+        logger.logger.error('Prediction failed')
+
+        error_log = tmp_path / 'error.log'
+        deadline = time.monotonic() + 5
+        while not error_log.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        try:
+            assert json.loads(error_log.read_text())['message'] == 'Prediction failed'
+        finally:
+            logger.shutdown()
+
+    def test_prediction_symptom_count(self, tmp_path, monkeypatch):
+        """Test that symptom lists and indicator vectors are counted the same way."""
+        import numpy as np
+
+        logger = StructuredLogger('test_symptom_count', log_dir=str(tmp_path))
+        calls = []
+        monkeypatch.setattr(logger, 'info', lambda message, **kwargs: calls.append(kwargs))
+        logger.log_prediction('flu', ['fever', 'cough'], 0.5, 0.01)
+        logger.log_prediction('flu', np.array([1, 0, 1, 0], dtype=np.float32), 0.5, 0.01)
+        assert calls[0]['symptoms_count'] == 2
+        assert calls[1]['symptoms_count'] == 2
+        assert isinstance(calls[1]['symptoms_count'], int)
+
+
+class TestRequestLogging:
+    """Tests for the request logging middleware and decorator."""
+
+    def test_middleware_and_decorator_log_once(self, tmp_path, monkeypatch):
+        """Test that a decorated view under RequestLogger gets one ID and one API log."""
+        structured = StructuredLogger('test_request_logging', log_dir=str(tmp_path))
+        monkeypatch.setattr(logger_module, '_global_logger', structured)
+        calls = []
+        monkeypatch.setattr(structured, 'log_api_request', lambda **kwargs: calls.append(kwargs))
+
+        app = Flask(__name__)
+        RequestLogger(app)
+        seen_ids = []
+
+        @app.route('/api/ml/diseases')
+        @log_request
+        def diseases():
+            seen_ids.append(g.request_id)
+            return {'success': True}
+
+        app.test_client().get('/api/ml/diseases')
+        assert len(calls) == 1
+        assert calls[0]['request_id'] == seen_ids[0]
+
+    def test_prediction_logged_from_result(self, tmp_path, monkeypatch):
+        """Test that the prediction log uses the view's result, not the response body."""
+        structured = StructuredLogger('test_prediction_logging', log_dir=str(tmp_path))
+        monkeypatch.setattr(logger_module, '_global_logger', structured)
+        calls = []
+        monkeypatch.setattr(structured, 'log_prediction', lambda **kwargs: calls.append(kwargs))
+
+        app = Flask(__name__)
+
+        @app.route('/api/ml/predict', methods=['POST'])
+        @log_prediction_request
+        def predict():
+            g.prediction_result = {'probability': 0.42}
+            return {'success': True}
+
+        app.test_client().post('/api/ml/predict', json={'disease': 'flu', 'symptoms': ['fever']})
+        assert calls[0]['disease'] == 'flu'
+        assert calls[0]['symptoms'] == ['fever']
+        assert calls[0]['probability'] == 0.42
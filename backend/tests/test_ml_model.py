@@ -0,0 +1,161 @@
+"""
+Tests for the symptom-based disease ML model.
+Tests single-disease scoring and the vectorized multi-disease path.
+"""
+
+import pytest
+from backend.models.ml_model import DiseaseMLModel, get_ml_model, ml_model
+
+
+@pytest.fixture(scope='module')
+def model():
+    """Create a model instance shared by the tests in this module."""
+    return DiseaseMLModel()
+
+
+class TestDiseaseKeyLookup:
+    """Tests for disease name normalization."""
+
+    @pytest.mark.parametrize('name, key', [
+        ('heart_disease', 'heart_disease'),
+        ('Heart Disease', 'heart_disease'),
+        ('heart-disease', 'heart_disease'),
+        ('heartdisease', 'heart_disease'),
+        ('COVID19', 'covid19'),
+    ])
+    def test_known_names(self, model, name, key):
+        """Test exact and fuzzy matches."""
+        assert model._get_disease_key(name) == key
+
+    def test_unknown_name(self, model):
+        """Test that unknown names raise ValueError."""
+        with pytest.raises(ValueError):
+            model._get_disease_key('not a disease')
+
+
+class TestPredictDiseaseProbability:
+    """Tests for single-disease scoring."""
+
+    def test_repeated_symptoms_count_once(self, model):
+        """Test that reporting a symptom twice does not add its weight twice."""
+        once = model.predict_disease_probability('covid19', ['fever', 'dry_cough'])
+        twice = model.predict_disease_probability('covid19', ['fever', 'fever', 'dry_cough'])
+        assert twice['raw_probability'] == pytest.approx(once['raw_probability'])
+        assert twice['symptoms_matched'] == 2
+        assert twice['total_symptoms'] == 3
+
+    def test_unknown_symptoms_ignored(self, model):
+        """Test that symptoms outside the disease do not change the score."""
+        base = model.predict_disease_probability('asthma', ['wheezing'])
+        extra = model.predict_disease_probability('asthma', ['wheezing', 'fever', 'bogus'])
+        assert extra['raw_probability'] == pytest.approx(base['raw_probability'])
+        assert extra['symptoms_matched'] == 1
+
+    def test_prebuilt_symptom_set(self, model):
+        """Test that passing the symptom set gives the same prediction."""
+        symptoms = ['fever', 'fever', 'dry_cough']
+        expected = model.predict_disease_probability('covid19', symptoms)
+        result = model.predict_disease_probability('covid19', symptoms, symptom_set=frozenset(symptoms))
+        assert result == expected
+
+    def test_age_adjusts_bias(self, model):
+        """Test that age shifts the score up for older and down for younger patients."""
+        adult = model.predict_disease_probability('diabetes', ['fatigue'], age=35)
+        older = model.predict_disease_probability('diabetes', ['fatigue'], age=60)
+        younger = model.predict_disease_probability('diabetes', ['fatigue'], age=15)
+        assert younger['raw_probability'] < adult['raw_probability'] < older['raw_probability']
+
+    def test_disease_symptoms_and_importance(self, model):
+        """Test the symptom listings for a disease."""
+        symptoms = model.get_disease_symptoms('Heart Disease')
+        assert list(symptoms)[0] == 'chest_pain'
+        assert symptoms['shortness_breath'] == 'Shortness Breath'
+        importance = model.get_symptom_importance('heart_disease')
+        assert list(importance.items())[0] == ('Chest Pain', 0.90)
+        # Different spellings of the same disease share one cached result
+        assert model.get_disease_symptoms('heart-disease') is symptoms
+        assert model.get_symptom_importance('Heart Disease') is importance
+
+    @pytest.mark.parametrize('weight_kg, category, effect', [
+        (50, 'Underweight', 0.25),
+        (56.7, 'Normal', 0.0),
+        (80, 'Overweight', 0.35),
+        (95, 'Obese', 0.6),
+    ])
+    def test_bmi_category_and_effect(self, model, weight_kg, category, effect):
+        """Test the BMI buckets at 1.74 m, including the 18.5 boundary."""
+        result = model.predict_disease_probability('diabetes', ['fatigue'], height_cm=174, weight_kg=weight_kg)
+        assert result['bmi_category'] == category
+        assert result['bmi_effect'] == effect
+
+    def test_no_bmi_without_measurements(self, model):
+        """Test that BMI fields are empty when height or weight is missing."""
+        result = model.predict_disease_probability('diabetes', ['fatigue'], height_cm=174)
+        assert result['bmi'] is None
+        assert result['bmi_category'] is None
+        assert result['bmi_effect'] == 0.0
+
+
+class TestPredictMultipleDiseases:
+    """Tests for differential diagnosis across all diseases."""
+
+    @pytest.mark.parametrize('symptoms', [
+        ['fever', 'dry_cough', 'fatigue'],
+        ['chest_pain', 'chest_pain', 'dizziness', 'not_a_symptom'],
+        ['not_a_symptom'],
+        [],
+    ])
+    def test_matches_single_disease_predictions(self, model, symptoms):
+        """Test that every disease scores the same as predict_disease_probability."""
+        predictions = model.predict_multiple_diseases(symptoms)
+        assert len(predictions) == len(model.get_available_diseases())
+
+        for prediction in predictions:
+            expected = model.predict_disease_probability(prediction['disease'], symptoms)
+            for key, value in expected.items():
+                if isinstance(value, float):
+                    # The batch path stores weights as float32
+                    assert prediction[key] == pytest.approx(value, abs=1e-6)
+                else:
+                    assert prediction[key] == value
+
+    def test_sorted_by_calibrated_probability(self, model):
+        """Test that results are ordered from most to least likely."""
+        predictions = model.predict_multiple_diseases(['wheezing', 'shortness_breath'])
+        probabilities = [p['calibrated_probability'] for p in predictions]
+        assert probabilities == sorted(probabilities, reverse=True)
+        assert predictions[0]['disease'] == 'asthma'
+
+
+class TestAnalyzeMissingSymptoms:
+    """Tests for the missing high-importance symptom analysis."""
+
+    def test_top_missing_symptoms(self, model):
+        """Test that reported symptoms are excluded and the rest sorted by weight."""
+        missing = model.analyze_missing_symptoms('covid19', ['loss_taste_smell', 'fever'])
+        assert [m['key'] for m in missing] == [
+            'difficulty_breathing', 'dry_cough', 'confusion', 'chest_pain'
+        ]
+        assert missing[0] == {
+            'key': 'difficulty_breathing', 'name': 'Difficulty Breathing', 'weight': 0.90
+        }
+
+    def test_at_most_five(self, model):
+        """Test that no more than five symptoms are returned."""
+        assert len(model.analyze_missing_symptoms('covid19', [])) == 5
+
+    def test_unknown_disease(self, model):
+        """Test that unknown diseases return an empty list."""
+        assert model.analyze_missing_symptoms('not_a_disease', ['fever']) == []
+
+
+class TestSharedModel:
+    """Tests for the lazily built module-level model."""
+
+    def test_proxy_delegates_to_one_instance(self):
+        """Test that ml_model forwards to the single shared DiseaseMLModel."""
+        assert get_ml_model() is get_ml_model()
+        assert isinstance(get_ml_model(), DiseaseMLModel)
+        assert ml_model.get_available_diseases() == get_ml_model().get_available_diseases()
+        assert ml_model.predict_disease_probability('asthma', ['wheezing']) == \
+            get_ml_model().predict_disease_probability('asthma', ['wheezing'])
@@ -0,0 +1,71 @@
+"""
+Tests for the blueprint route tables.
+Tests that every lazily imported view resolves to a callable.
+"""
+
+import ast
+import importlib
+import importlib.util
+import pytest
+from backend import create_app
+from backend.routes import LazyView
+
+
+def top_level_functions(module_name):
+    """Names of the functions defined at the top level of a module's source."""
+    with open(importlib.util.find_spec(module_name).origin, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Create an application with every blueprint registered, on an in-memory database."""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    return create_app()
+
+
+class TestLazyViews:
+    """Tests for the LazyView route tables in backend/routes/__init__.py."""
+
+    def test_every_lazy_view_resolves(self, app):
+        """Test that each LazyView names an existing view function."""
+        lazy_views = {
+            endpoint: view for endpoint, view in app.view_functions.items()
+            if isinstance(view, LazyView)
+        }
+        assert lazy_views
+
+        for endpoint, view in lazy_views.items():
+            try:
+                importlib.import_module(view.__module__)
+            except ModuleNotFoundError as e:
+                # Optional third-party dependency (e.g. TensorFlow) not
+                # installed here; check the module source for the function
+                if not e.name or e.name.startswith('backend'):
+                    raise
+                assert view.__name__ in top_level_functions(view.__module__), endpoint
+                continue
+            assert callable(view.view), endpoint
+
+
+class TestCachedRender:
+    """Tests for the cached calculator page."""
+
+    def test_page_without_diseases_not_cached(self, app, monkeypatch):
+        """Test that a render with an unreadable disease file is not kept."""
+        from backend.routes import disease_routes
+
+        def unreadable():
+            raise FileNotFoundError('hospital_data.csv')
+
+        client = app.test_client()
+        with monkeypatch.context() as m:
+            m.setattr(disease_routes, '_load_disease_table', unreadable)
+            response = client.get('/calculator')
+        assert response.status_code == 200
+        assert '<option value="Influenza">' not in response.get_data(as_text=True)
+
+        response = client.get('/calculator')
+        assert '<option value="Influenza">' in response.get_data(as_text=True)
+        assert response.headers['ETag']
@@ -0,0 +1,229 @@
+"""
+Tests for the rate limiting and security middleware.
+Tests rate limit windows and input validation.
+"""
+
+import threading
+import pytest
+from flask import Flask
+from backend.middleware import security
+from backend.middleware.security import (
+    RateLimiter,
+    SecurityValidator,
+    rate_limit,
+    validate_request_data,
+)
+
+
+@pytest.fixture
+def app():
+    """Create a minimal application for request contexts."""
+    return Flask(__name__)
+
+
+class TestRateLimiter:
+    """Tests for the sliding window rate limiter."""
+
+    def test_requests_within_limit(self, app):
+        """Test that requests under the limit are allowed with a decreasing remainder."""
+        limiter = RateLimiter()
+        with app.test_request_context('/api/ml/predict'):
+            assert limiter.check_rate_limit('report') == (True, 0, 9)
+            assert limiter.check_rate_limit('report') == (True, 0, 8)
+
+    def test_limit_exceeded(self, app):
+        """Test that the request after the limit is rejected with a retry delay."""
+        limiter = RateLimiter()
+        with app.test_request_context('/api/ml/predict'):
+            for _ in range(10):
+                assert limiter.check_rate_limit('report')[0]
+            allowed, retry_after, remaining = limiter.check_rate_limit('report')
+        assert not allowed
+        assert 0 < retry_after <= 61
+        assert remaining == 0
+
+    def test_expired_requests_released(self, app, monkeypatch):
+        """Test that requests older than the window no longer count."""
+        limiter = RateLimiter()
+        now = [1000.0]
+        monkeypatch.setattr(security.time, 'monotonic', lambda: now[0])
+        with app.test_request_context('/api/ml/predict'):
+            for _ in range(10):
+                limiter.check_rate_limit('report')
+            assert not limiter.check_rate_limit('report')[0]
+            now[0] += 61
+            assert limiter.check_rate_limit('report') == (True, 0, 9)
+        assert limiter.get_stats()['total_requests'] == 1
+
+    def test_clients_tracked_separately(self, app):
+        """Test that different clients have separate windows."""
+        limiter = RateLimiter()
+        for _ in range(10):
+            with app.test_request_context(environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+                limiter.check_rate_limit('report')
+        with app.test_request_context(environ_base={'REMOTE_ADDR': '10.0.0.2'}):
+            assert limiter.check_rate_limit('report')[0]
+        assert limiter.get_stats()['total_identifiers'] == 2
+
+    def test_user_agents_tracked_separately(self, app):
+        """Test that the user agent is part of the client identifier."""
+        limiter = RateLimiter()
+        for agent in ('curl/8.0', 'Mozilla/5.0'):
+            with app.test_request_context(headers={'User-Agent': agent}):
+                limiter.check_rate_limit('report')
+        assert limiter.get_stats()['total_identifiers'] == 2
+
+    def test_least_recent_client_evicted(self, app, monkeypatch):
+        """Test that the number of tracked clients is capped."""
+        limiter = RateLimiter()
+        monkeypatch.setattr(limiter, 'MAX_IDENTIFIERS', 2)
+        for addr in ('10.0.0.1', '10.0.0.2', '10.0.0.1', '10.0.0.3'):
+            with app.test_request_context(environ_base={'REMOTE_ADDR': addr}):
+                limiter.check_rate_limit('report')
+        assert [ip for ip, _ in limiter._requests] == ['10.0.0.1', '10.0.0.3']
+
+    def test_check_waits_for_lock(self, app):
+        """Test that the lookup, eviction and append run under the limiter's lock."""
+        limiter = RateLimiter()
+        results = []
+
+        def check():
+            with app.test_request_context():
+                results.append(limiter.check_rate_limit('report'))
+
+        thread = threading.Thread(target=check)
+        with limiter._lock:
+            thread.start()
+            thread.join(timeout=0.1)
+            assert results == []
+            assert not limiter._requests
+        thread.join()
+        assert results == [(True, 0, 9)]
+
+
+class TestRateLimitDecorator:
+    """Tests for the rate_limit decorator headers."""
+
+    def test_limit_headers(self, app, monkeypatch):
+        """Test that allowed responses carry the limit and remaining headers."""
+        monkeypatch.setattr(security, 'rate_limiter', RateLimiter())
+
+        @app.route('/report')
+        @rate_limit('report')
+        def report():
+            return app.response_class('ok')
+
+        @app.route('/custom')
+        @rate_limit('custom')
+        def custom():
+            return app.response_class('ok')
+
+        client = app.test_client()
+        response = client.get('/report')
+        assert response.headers['X-RateLimit-Limit'] == '10'
+        assert response.headers['X-RateLimit-Remaining'] == '9'
+        assert client.get('/custom').headers['X-RateLimit-Limit'] == '100'
+
+
+class TestSecurityValidator:
+    """Tests for input validation."""
+
+    @pytest.mark.parametrize('value', [
+        '<script>alert(1)</script>',
+        'JavaScript:void(0)',
+        '<img onerror = "x">',
+        '<iframe src="x">',
+    ])
+    def test_xss_detected(self, value):
+        """Test that each XSS pattern is caught."""
+        is_valid, error = SecurityValidator().validate_input(value, 'symptom')
+        assert not is_valid
+        assert 'XSS' in error
+
+    @pytest.mark.parametrize('value', [
+        'union all select password',
+        'SELECT * FROM users',
+        'insert into users',
+        'drop table users',
+        'delete from users',
+    ])
+    def test_sql_injection_detected(self, value):
+        """Test that each SQL pattern is caught."""
+        is_valid, error = SecurityValidator().validate_input(value, 'symptom')
+        assert not is_valid
+        assert 'SQL' in error
+
+    def test_nested_values_checked(self):
+        """Test that strings inside lists and dicts are checked."""
+        validator = SecurityValidator()
+        assert validator.validate_input(42, 'age') == (True, None)
+        assert validator.validate_input({'notes': ['fever', 37.5]}, 'patient') == (True, None)
+        is_valid, error = validator.validate_input({'notes': ['drop table users']}, 'patient')
+        assert not is_valid
+        assert error == 'Potential SQL injection detected in patient'
+
+    def test_plain_symptoms_pass(self):
+        """Test that ordinary symptom lists are accepted."""
+        validator = SecurityValidator()
+        assert validator.validate_symptoms(['fever', 'dry cough', 'shortness of breath']) == (True, None)
+
+    def test_dangerous_symptom_in_list(self):
+        """Test that a dangerous symptom is reported from within a list."""
+        validator = SecurityValidator()
+        is_valid, error = validator.validate_symptoms(['fever', 'cough', '<script>x</script>'])
+        assert not is_valid
+        assert error == 'Potential XSS attack detected in symptom'
+
+    def test_match_across_symptoms_is_not_flagged(self):
+        """Test that a pattern spanning two clean symptoms is not an error."""
+        validator = SecurityValidator()
+        assert validator.validate_symptoms(['onset', '= sudden']) == (True, None)
+
+    def test_sanitize_and_disease_name(self):
+        """Test string sanitizing and disease name format checks."""
+        validator = SecurityValidator()
+        assert validator.sanitize_string(' <b>"flu"</b> ') == 'bflu/b'
+        assert validator.validate_disease_name('heart_disease') == (True, None)
+        assert not validator.validate_disease_name('flu; drop')[0]
+        assert validator.validate_disease_name('heart-disease type 2') == (True, None)
+        assert validator.validate_disease_name('flu\tb') == (True, None)
+        assert not validator.validate_disease_name('grippé')[0]
+
+
+class TestValidateRequestData:
+    """Tests for the request body validation decorator."""
+
+    @pytest.fixture
+    def client(self, app):
+        """Create a test client with a validated endpoint."""
+        @app.route('/api/ml/predict', methods=['POST'])
+        @validate_request_data(required_fields=['disease', 'symptoms'], optional_fields=['age'])
+        def predict():
+            return {'success': True}
+
+        return app.test_client()
+
+    def test_valid_body(self, client):
+        """Test that an allowed body reaches the view."""
+        response = client.post('/api/ml/predict', json={'disease': 'flu', 'symptoms': ['fever'], 'age': 30})
+        assert response.status_code == 200
+
+    def test_invalid_json(self, client):
+        """Test that malformed and non-JSON bodies are rejected."""
+        response = client.post('/api/ml/predict', data='{bad', content_type='application/json')
+        assert response.get_json()['error'] == 'Invalid JSON'
+        response = client.post('/api/ml/predict', data={'disease': 'flu'})
+        assert response.get_json()['error'] == 'Invalid JSON'
+
+    def test_unknown_field(self, client):
+        """Test that fields outside the allowed set are rejected."""
+        response = client.post('/api/ml/predict', json={'disease': 'flu', 'symptoms': ['fever'], 'debug': True})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid field'
+
+    def test_missing_and_dangerous_fields(self, client):
+        """Test missing required fields and unsafe values."""
+        response = client.post('/api/ml/predict', json={'disease': 'flu'})
+        assert response.get_json()['missing_fields'] == ['symptoms']
+        response = client.post('/api/ml/predict', json={'disease': 'flu', 'symptoms': ['<script>x</script>']})
+        assert response.get_json()['error'] == 'Security validation failed'
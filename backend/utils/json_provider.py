@@ -0,0 +1,49 @@
+"""
+orjson-backed JSON provider for Flask.
+Used for jsonify() responses and request.get_json() parsing.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes and parses with orjson.
+
+    Types orjson does not handle natively fall back to Flask's default
+    serializer. NumPy arrays and scalars are serialized directly. Note that
+    orjson writes datetimes as ISO 8601 strings.
+    """
+
+    def _option(self, sort_keys, indent):
+        """Build the orjson option flags for one call."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON text."""
+        option = self._option(kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent'))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON text or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Serialize the arguments and return a JSON response.
+
+        The body is passed to the response as the bytes orjson produced,
+        skipping the decode to str and re-encode that dumps() would need.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._option(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+        )
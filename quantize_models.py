@@ -0,0 +1,39 @@
+"""
+Convert the Keras eye disease model to a quantized TFLite model.
+
+Weights are stored as int8 (dynamic-range quantization), which shrinks
+the model about 4x and speeds up CPU inference. Inputs and outputs stay
+float32, so the existing preprocessing works unchanged.
+
+Usage:
+    python quantize_models.py
+
+Then point MODEL_CONFIG["eyes"] in
+backend/routes/predict_disease_type_routes.py at the new file with
+"format": "tflite", and compare its predictions with the Keras model on
+a few labelled images before deploying.
+"""
+
+import os
+
+import tensorflow as tf
+
+MODELS_DIR = os.path.join("backend", "models", "resnet50_models")
+SOURCE = os.path.join(MODELS_DIR, "eye_disease_resnet50_fp16.keras")
+TARGET = os.path.join(MODELS_DIR, "eye_disease_resnet50_int8.tflite")
+
+
+def quantize():
+    model = tf.keras.models.load_model(SOURCE, compile=False)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_model = converter.convert()
+
+    with open(TARGET, "wb") as f:
+        f.write(tflite_model)
+    print(f"✅ Wrote {TARGET} ({len(tflite_model) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    quantize()